@@ -9,6 +9,9 @@ import os
 from datetime import datetime
 from typing import List, Dict
 
+# Below this many words there is nothing meaningful to analyze
+MIN_ARTICLE_WORDS = 100
+
 def handler(request):
     """Vercel function handler for AI analysis."""
     
@@ -144,6 +147,17 @@ def analyze_comment(comment_text: str) -> Dict:
 
 def analyze_article(article_content: str) -> Dict:
     """Analyze an article using OpenAI."""
+    if len(article_content.split(None, MIN_ARTICLE_WORDS)) < MIN_ARTICLE_WORDS:
+        # Paywalled or JS-only extracts: skip the API round trip
+        return {
+            "summary": "Not enough article text to analyze",
+            "key_insights": "",
+            "discussion_potential": 1,
+            "main_themes": [],
+            "sentiment": "neutral",
+            "insufficient_text": True
+        }
+
     try:
         from openai import OpenAI
         
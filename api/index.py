@@ -4,13 +4,18 @@ Main Flask API entry point for Vercel serverless deployment.
 Supports both SQLite (local) and DynamoDB (production) storage.
 """
 
+import heapq
 import html
 import json
 import os
 import sqlite3
 import sys
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
@@ -23,7 +28,7 @@ load_dotenv()
 
 # Try to import DynamoDB manager and podcast generator
 try:
-    from dynamodb_manager import DynamoDBManager
+    from dynamodb_manager import get_dynamo
     DYNAMODB_AVAILABLE = True
 except ImportError:
     DYNAMODB_AVAILABLE = False
@@ -37,6 +42,13 @@ except ImportError:
     PODCAST_AVAILABLE = False
     print("Podcast generator not available")
 
+# Podcast generators open DynamoDB, TTS and OpenAI clients when built and keep
+# no per-episode state, so each class is built once and shared by all requests
+@lru_cache(maxsize=None)
+def get_podcast_generator(generator_class):
+    """Return the process-wide instance of a podcast generator class."""
+    return generator_class()
+
 app = Flask(__name__, 
            template_folder='./templates',
            static_folder='../static')
@@ -56,10 +68,15 @@ DB_PATH = os.environ.get(
     '/tmp/enhanced_hn_articles.db' if os.environ.get('VERCEL') else 'enhanced_hn_articles.db'
 )
 
+def _missing_or_empty(path: str) -> bool:
+    """Check whether a file is absent or empty with a single stat call."""
+    try:
+        return os.stat(path).st_size == 0
+    except OSError:
+        return True
+
 # If DB_PATH missing or empty, fall back to bundled backup if available
-if not USE_DYNAMODB and (
-    not os.path.exists(DB_PATH) or os.path.getsize(DB_PATH) == 0
-):
+if not USE_DYNAMODB and _missing_or_empty(DB_PATH):
     for fname in os.listdir('.'):
         if fname.startswith('enhanced_hn_articles.db') and 'backup' in fname:
             DB_PATH = fname
@@ -68,6 +85,9 @@ if not USE_DYNAMODB and (
 print(f"Database mode: {'DynamoDB' if USE_DYNAMODB else 'SQLite'}")
 print(f"SQLite path: {DB_PATH if not USE_DYNAMODB else 'N/A'}")
 
+# Article lists and stats are reused for requests within the same window
+API_CACHE_SECONDS = 30
+
 class DatabaseManager:
     """Unified database manager supporting both SQLite and DynamoDB."""
     
@@ -75,9 +95,13 @@ class DatabaseManager:
         self.use_dynamodb = use_dynamodb
         # Fall back to global DB_PATH if none provided
         self.db_path = db_path or DB_PATH
+        self._local = threading.local()
+        self._articles_cache = (None, {})
+        self._articles_cache_lock = threading.Lock()
+        self._stats_cache = None
         
         if self.use_dynamodb:
-            self.dynamo_db = DynamoDBManager()
+            self.dynamo_db = get_dynamo()
         else:
             self.init_sqlite_db()
     
@@ -150,17 +174,39 @@ class DatabaseManager:
             conn.close()
     
     def get_connection(self):
-        """Get database connection (SQLite only)."""
+        """Get this thread's database connection (SQLite only), opening it on first use.
+        
+        Connections live for the lifetime of the worker thread, so callers
+        must not close them.
+        """
         if self.use_dynamodb:
             return None
-        return sqlite3.connect(self.db_path)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            self._local.conn = conn
+        return conn
     
     def get_articles_with_analysis(self, limit: int = 50, sort_by: str = 'score') -> List[Dict]:
-        """Get articles with comprehensive data."""
-        if self.use_dynamodb:
-            return self._get_articles_dynamodb(limit, sort_by)
-        else:
-            return self._get_articles_sqlite(limit, sort_by)
+        """Get articles with comprehensive data, cached for API_CACHE_SECONDS.
+        
+        Callers get their own copies of the article dicts and may modify them.
+        """
+        bucket = int(time.time() // API_CACHE_SECONDS)
+        key = (limit, sort_by)
+        with self._articles_cache_lock:
+            cached_bucket, cache = self._articles_cache
+            if cached_bucket != bucket:
+                cache = {}
+                self._articles_cache = (bucket, cache)
+            
+            if key not in cache:
+                if self.use_dynamodb:
+                    cache[key] = self._get_articles_dynamodb(limit, sort_by)
+                else:
+                    cache[key] = self._get_articles_sqlite(limit, sort_by)
+            articles = cache[key]
+        return [dict(article) for article in articles]
     
     def _get_articles_dynamodb(self, limit: int, sort_by: str) -> List[Dict]:
         """Get articles from DynamoDB."""
@@ -255,7 +301,6 @@ class DatabaseManager:
                     'story_text': ''
                 })
         
-        conn.close()
         return articles
     
     def get_single_article(self, article_id: str) -> Optional[Dict]:
@@ -322,7 +367,6 @@ class DatabaseManager:
         
         row = cursor.fetchone()
         if not row:
-            conn.close()
             return None
         
         article = {
@@ -342,7 +386,6 @@ class DatabaseManager:
         comments = self.get_article_comments_sqlite(article_id)
         article['comments'] = comments
         
-        conn.close()
         return article
     
     def get_article_comments_sqlite(self, article_id: str) -> List[Dict]:
@@ -369,15 +412,21 @@ class DatabaseManager:
                 'level': row[5]
             })
         
-        conn.close()
         return comments
     
     def get_database_stats(self) -> Dict:
-        """Get comprehensive database statistics."""
+        """Get comprehensive database statistics, cached for API_CACHE_SECONDS."""
+        bucket = int(time.time() // API_CACHE_SECONDS)
+        cached = self._stats_cache
+        if cached and cached[0] == bucket:
+            return cached[1]
+        
         if self.use_dynamodb:
-            return self._get_stats_dynamodb()
+            stats = self._get_stats_dynamodb()
         else:
-            return self._get_stats_sqlite()
+            stats = self._get_stats_sqlite()
+        self._stats_cache = (bucket, stats)
+        return stats
     
     def _get_stats_dynamodb(self) -> Dict:
         """Get stats from DynamoDB."""
@@ -440,8 +489,6 @@ class DatabaseManager:
         else:
             domains = ['example.com', 'github.com', 'techcrunch.com']
         
-        conn.close()
-        
         return {
             'total_articles': total_articles,
             'total_comments': total_comments,
@@ -717,7 +764,7 @@ def generate_daily_briefing(articles: List[Dict], current_date: str) -> str:
         categories[cat] = categories.get(cat, 0) + 1
     
     # Build briefing
-    top_categories = sorted(categories.items(), key=lambda x: x[1], reverse=True)[:3]
+    top_categories = heapq.nlargest(3, categories.items(), key=lambda x: x[1])
     
     category_text = ""
     if len(top_categories) == 1:
@@ -730,64 +777,61 @@ def generate_daily_briefing(articles: List[Dict], current_date: str) -> str:
     
     return f"Good morning. It's {current_date}, and we're covering {len(articles)} significant stories from the community today, {category_text}. From innovative developments to industry insights, these stories represent the conversations shaping our evolving landscape."
 
+def _with_web_audio_url(episode: Dict) -> Dict:
+    """Point a locally stored episode's audio_url at the /audio route."""
+    if episode.get('audio_path'):
+        audio_filename = episode['audio_path'].split('/')[-1]
+        episode['audio_url'] = f'/audio/{audio_filename}'
+    elif (episode.get('audio_url') or '').startswith('file://'):
+        audio_filename = episode['audio_url'].split('/')[-1]
+        episode['audio_url'] = f'/audio/{audio_filename}'
+    return episode
+
+def _todays_daily_episode() -> Optional[Dict]:
+    """Get today's daily podcast episode, if it has been generated."""
+    from complete_podcast_runner import CompletePodcastGenerator
+    recent = get_podcast_generator(CompletePodcastGenerator).get_recent_episodes(1)
+    if recent and recent[0].get('date') == datetime.now().strftime('%Y-%m-%d'):
+        return _with_web_audio_url(recent[0])
+    return None
+
+def _latest_weekly_episode() -> Optional[Dict]:
+    """Get the most recent weekly podcast episode, if any."""
+    from weekly_podcast_generator import WeeklyPodcastGenerator
+    recent = get_podcast_generator(WeeklyPodcastGenerator).get_recent_weekly_episodes(1)
+    return _with_web_audio_url(recent[0]) if recent else None
+
 @app.route('/')
 def home():
     """Enhanced homepage with daily podcast and current date."""
     try:
-        # Get basic stats
-        stats = db_manager.get_database_stats()
-        
-        # Get sort parameter
-        sort_by = request.args.get('sort', 'score')
-        
-        # Get articles for homepage (limit to 10 for headlines)
-        articles = db_manager.get_articles_with_analysis(limit=10, sort_by=sort_by)
-        
-        # Add categories to articles
-        for article in articles:
-            article['category'] = get_article_category(article)
-        
-        # Get today's podcast episode and this week's episode if available
-        today_episode = None
-        weekly_episode = None
-        try:
-            from complete_podcast_runner import CompletePodcastGenerator
-            from weekly_podcast_generator import WeeklyPodcastGenerator
+        # Episode lookups go to DynamoDB over the network, so start them
+        # first and let them overlap the local database queries below
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            daily_future = executor.submit(_todays_daily_episode)
+            weekly_future = executor.submit(_latest_weekly_episode)
             
-            # Daily podcast
-            daily_generator = CompletePodcastGenerator()
-            today = datetime.now().strftime('%Y-%m-%d')
+            # Get basic stats
+            stats = db_manager.get_database_stats()
             
-            # Try to get today's episode
-            recent_daily = daily_generator.get_recent_episodes(1)
-            if recent_daily and recent_daily[0].get('date') == today:
-                today_episode = recent_daily[0]
-                # Ensure audio path or url is accessible via /audio
-                if today_episode.get('audio_path'):
-                    audio_filename = today_episode['audio_path'].split('/')[-1]
-                    today_episode['audio_url'] = f'/audio/{audio_filename}'
-                elif today_episode.get('audio_url'):
-                    au = today_episode['audio_url']
-                    if au.startswith('file://'):
-                        audio_filename = au.split('/')[-1]
-                        today_episode['audio_url'] = f'/audio/{audio_filename}'
-
-            # Weekly podcast
-            weekly_generator = WeeklyPodcastGenerator()
-            recent_weekly = weekly_generator.get_recent_weekly_episodes(1)
-            if recent_weekly:
-                weekly_episode = recent_weekly[0]
-                # Ensure audio path or url is accessible via /audio
-                if weekly_episode.get('audio_path'):
-                    audio_filename = weekly_episode['audio_path'].split('/')[-1]
-                    weekly_episode['audio_url'] = f'/audio/{audio_filename}'
-                elif weekly_episode.get('audio_url'):
-                    au = weekly_episode['audio_url']
-                    if au.startswith('file://'):
-                        audio_filename = au.split('/')[-1]
-                        weekly_episode['audio_url'] = f'/audio/{audio_filename}'
-        except Exception as e:
-            print(f"Error getting podcast episodes: {e}")
+            # Get sort parameter
+            sort_by = request.args.get('sort', 'score')
+            
+            # Get articles for homepage (limit to 10 for headlines)
+            articles = db_manager.get_articles_with_analysis(limit=10, sort_by=sort_by)
+            
+            # Add categories to articles
+            for article in articles:
+                article['category'] = get_article_category(article)
+            
+            # Get today's podcast episode and this week's episode if available
+            today_episode = None
+            weekly_episode = None
+            try:
+                today_episode = daily_future.result()
+                weekly_episode = weekly_future.result()
+            except Exception as e:
+                print(f"Error getting podcast episodes: {e}")
         
         # Get search parameters
         search_query = request.args.get('search', '')
@@ -837,14 +881,14 @@ def article_detail(article_id):
         # Get talking points from top comments
         talking_points = []
         if article.get('comments'):
-            # Sort comments by score and extract high-quality ones
-            sorted_comments = sorted(
-                [c for c in article['comments'] if c.get('score', 0) >= 3],
-                key=lambda x: x.get('score', 0),
-                reverse=True
+            # Take the top-scored comments and extract high-quality ones
+            top_comments = heapq.nlargest(
+                5,
+                (c for c in article['comments'] if c.get('score', 0) >= 3),
+                key=lambda x: x.get('score', 0)
             )
             
-            for comment in sorted_comments[:5]:  # Top 5 comments
+            for comment in top_comments:  # Top 5 comments
                 if comment.get('content') and len(comment.get('content', '')) > 100:
                     talking_points.append({
                         'text': comment['content'][:300] + ('...' if len(comment['content']) > 300 else ''),
@@ -947,7 +991,7 @@ def api_podcast_episodes():
             return jsonify({'error': 'Podcast functionality not available'}), 503
         
         days = request.args.get('days', 7, type=int)
-        generator = DailyPodcastGenerator()
+        generator = get_podcast_generator(DailyPodcastGenerator)
         episodes = generator.get_recent_episodes(days)
         
         return jsonify({
@@ -964,7 +1008,7 @@ def api_podcast_episode(date):
         if not PODCAST_AVAILABLE:
             return jsonify({'error': 'Podcast functionality not available'}), 503
         
-        generator = DailyPodcastGenerator()
+        generator = get_podcast_generator(DailyPodcastGenerator)
         
         # Try to get existing episode
         try:
@@ -988,7 +1032,7 @@ def api_podcast_generate():
         data = request.get_json() or {}
         date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
         
-        generator = DailyPodcastGenerator()
+        generator = get_podcast_generator(DailyPodcastGenerator)
         episode = generator.generate_daily_episode(date)
         
         if episode:
@@ -1013,7 +1057,7 @@ def podcast_dashboard():
                                  title="Podcast Unavailable",
                                  message="Podcast functionality is not available.")
         
-        generator = DailyPodcastGenerator()
+        generator = get_podcast_generator(DailyPodcastGenerator)
         recent_episodes = generator.get_recent_episodes(7)
         
         return render_template('podcast.html', 
@@ -1033,7 +1077,7 @@ def api_weekly_podcast_episodes():
         
         weeks = request.args.get('weeks', 4, type=int)
         from weekly_podcast_generator import WeeklyPodcastGenerator
-        generator = WeeklyPodcastGenerator()
+        generator = get_podcast_generator(WeeklyPodcastGenerator)
         episodes = generator.get_recent_weekly_episodes(weeks)
         
         return jsonify({
@@ -1054,7 +1098,7 @@ def api_weekly_podcast_generate():
         date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
         
         from weekly_podcast_generator import WeeklyPodcastGenerator
-        generator = WeeklyPodcastGenerator()
+        generator = get_podcast_generator(WeeklyPodcastGenerator)
         episode = generator.generate_weekly_episode(date)
         
         if episode:
@@ -10,17 +10,28 @@ import sys
 import requests
 from datetime import datetime
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 # Optional DynamoDB support
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 try:
-    from dynamodb_manager import DynamoDBManager
+    from dynamodb_manager import get_dynamo
     USE_DYNAMODB = True
 except ImportError:
     USE_DYNAMODB = False
     print("DynamoDB not available, using local storage")
 
+# Only advertise brotli when urllib3 can decode it
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# Only story rows are needed, so skip building the rest of the tree
+_STORY_ROWS = SoupStrainer('tr', class_='athing')
+_TITLELINE_ATTRS = {'class': 'titleline'}
+
 
 def handler(request):
     """Main handler function for Vercel serverless."""
@@ -71,17 +82,20 @@ def handler(request):
 def scrape_hn_articles(limit=20):
     """Scrape HN articles from the 'best' page."""
     url = "https://news.ycombinator.com/best"
-    headers = {'User-Agent': 'Mozilla/5.0 (compatible; HN-Scraper-Vercel/1.0)'}
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (compatible; HN-Scraper-Vercel/1.0)',
+        'Accept-Encoding': ACCEPT_ENCODING
+    }
 
     response = requests.get(url, headers=headers)
     response.raise_for_status()
 
-    soup = BeautifulSoup(response.content, 'html.parser')
+    soup = BeautifulSoup(response.content, 'html.parser', parse_only=_STORY_ROWS)
     articles = []
 
-    for i, item in enumerate(soup.find_all('tr', class_='athing')[:limit]):
+    for i, item in enumerate(soup.find_all('tr', limit=limit)):
         try:
-            title_elem = item.find('span', class_='titleline')
+            title_elem = item.find('span', attrs=_TITLELINE_ATTRS)
             link_elem = title_elem.find('a') if title_elem else None
             if not link_elem:
                 continue
@@ -117,7 +131,7 @@ def store_articles(articles):
     """Store scraped articles in DynamoDB or fallback log."""
     try:
         if USE_DYNAMODB:
-            db_manager = DynamoDBManager()
+            db_manager = get_dynamo()
             for article in articles:
                 db_manager.store_article(
                     hn_id=article['hn_id'],
@@ -17,22 +17,25 @@ def run_incremental_scrape():
     
     scraper = HNScraper()
     
-    # Run with limited articles to reduce load
-    results = scraper.scrape_daily(max_articles=10, max_comments_per_article=30)
-    
-    # Print results
-    print(f"\nScrape Results:")
-    print(f"  - New articles: {results['scraped_articles']}")
-    print(f"  - New comments: {results['total_comments']}")
-    print(f"  - Success: {results['success']}")
-    
-    # Print database stats
-    stats = scraper.get_stats()
-    print(f"\nDatabase Stats:")
-    print(f"  - Total articles: {stats['total_articles']}")
-    print(f"  - Total comments: {stats['total_comments']}")
-    print(f"  - Average score: {stats['avg_score']}")
-    print(f"  - Unique domains: {stats['unique_domains']}")
+    try:
+        # Run with limited articles to reduce load
+        results = scraper.scrape_daily(max_articles=10, max_comments_per_article=30)
+        
+        # Print results
+        print(f"\nScrape Results:")
+        print(f"  - New articles: {results['scraped_articles']}")
+        print(f"  - New comments: {results['total_comments']}")
+        print(f"  - Success: {results['success']}")
+        
+        # Print database stats
+        stats = scraper.get_stats()
+        print(f"\nDatabase Stats:")
+        print(f"  - Total articles: {stats['total_articles']}")
+        print(f"  - Total comments: {stats['total_comments']}")
+        print(f"  - Average score: {stats['avg_score']}")
+        print(f"  - Unique domains: {stats['unique_domains']}")
+    finally:
+        scraper.close()
     
     print(f"\nNext scrape scheduled for 2 hours from now...")
     print(f"{'='*60}\n")
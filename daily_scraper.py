@@ -13,15 +13,37 @@ from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
 
+# Write-path tuning for every scraper connection: WAL journaling with NORMAL
+# syncs, so a commit costs one WAL append instead of a full journal fsync
+WRITE_PRAGMAS = [
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA temp_store = MEMORY',
+]
+
 class HNScraper:
     def __init__(self, db_path: str = "enhanced_hn_articles.db"):
         self.db_path = db_path
         self.base_url = "https://hacker-news.firebaseio.com/v0"
+        # One connection for the scraper's lifetime, so pragmas are applied
+        # once and sqlite3's statement cache carries across articles
+        self.conn = self.connect()
         self.init_database()
     
+    def connect(self) -> sqlite3.Connection:
+        """Open a database connection with the write pragmas applied."""
+        conn = sqlite3.connect(self.db_path)
+        for pragma in WRITE_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def close(self):
+        """Close the scraper's database connection."""
+        self.conn.close()
+    
     def init_database(self):
         """Initialize database with improved schema."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.conn
         cursor = conn.cursor()
         
         # Enhanced articles table
@@ -83,7 +105,6 @@ class HNScraper:
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_comments_parent_id ON comments(parent_id)')
         
         conn.commit()
-        conn.close()
     
     def get_item(self, item_id: int) -> Optional[Dict]:
         """Get a single item (article or comment) from HN API."""
@@ -116,11 +137,24 @@ class HNScraper:
             return "unknown"
     
     def scrape_comments(self, article_id: str, comment_ids: List[int], level: int = 0, parent_id: str = None) -> int:
-        """Recursively scrape comments for an article."""
-        if not comment_ids or level > 5:  # Limit depth to prevent infinite recursion
+        """Scrape an article's comment tree and store it in a single transaction."""
+        rows = []
+        self._collect_comments(article_id, comment_ids, level, parent_id, rows)
+        if not rows:
             return 0
         
-        comment_count = 0
+        with self.conn:
+            self.conn.executemany('''
+                INSERT OR REPLACE INTO comments 
+                (comment_id, article_id, parent_id, author, content, time_posted, level)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+        return len(rows)
+    
+    def _collect_comments(self, article_id: str, comment_ids: List[int], level: int, parent_id: Optional[str], rows: List[tuple]):
+        """Recursively fetch comments, appending a comments row for each one kept."""
+        if not comment_ids or level > 5:  # Limit depth to prevent infinite recursion
+            return
         
         for comment_id in comment_ids:
             if not comment_id:
@@ -130,16 +164,7 @@ class HNScraper:
             if not comment_data or comment_data.get('deleted') or comment_data.get('dead'):
                 continue
             
-            # Use a separate connection for each comment to avoid locks
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Insert comment
-            cursor.execute('''
-                INSERT OR REPLACE INTO comments 
-                (comment_id, article_id, parent_id, author, content, time_posted, level)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            rows.append((
                 str(comment_id),
                 article_id,
                 parent_id,
@@ -149,24 +174,18 @@ class HNScraper:
                 level
             ))
             
-            conn.commit()
-            conn.close()
-            comment_count += 1
-            
             # Recursively scrape replies
             if 'kids' in comment_data:
-                reply_count = self.scrape_comments(
+                self._collect_comments(
                     article_id, 
                     comment_data['kids'], 
                     level + 1, 
-                    str(comment_id)
+                    str(comment_id),
+                    rows
                 )
-                comment_count += reply_count
             
             # Rate limiting
             time.sleep(0.1)
-        
-        return comment_count
     
     def scrape_daily(self, max_articles: int = 15, max_comments_per_article: int = 100) -> Dict:
         """Main scraping function to run daily."""
@@ -177,13 +196,11 @@ class HNScraper:
         print(f"Found {len(story_ids)} top stories")
         
         # Check which articles we already have
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
         # Get existing article IDs
         cursor.execute('SELECT hn_id FROM articles')
         existing_ids = {row[0] for row in cursor.fetchall()}
-        conn.close()
         print(f"Found {len(existing_ids)} existing articles in database")
         
         # Filter out existing articles
@@ -216,9 +233,7 @@ class HNScraper:
             num_comments = story_data.get('descendants', 0)
             story_text = story_data.get('text', '')
             
-            # Use separate connection for each article
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self.conn.cursor()
             
             # Insert article
             cursor.execute('''
@@ -251,8 +266,7 @@ class HNScraper:
                 f"Score: {score}, Comments: {num_comments}, Author: {author}"
             ))
             
-            conn.commit()
-            conn.close()
+            self.conn.commit()
             
             scraped_articles += 1
             print(f"Scraped article {scraped_articles}: {title[:50]}...")
@@ -279,8 +293,7 @@ class HNScraper:
     
     def get_stats(self) -> Dict:
         """Get database statistics."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
         cursor.execute('SELECT COUNT(*) FROM articles')
         total_articles = cursor.fetchone()[0]
@@ -294,8 +307,6 @@ class HNScraper:
         cursor.execute('SELECT COUNT(DISTINCT domain) FROM articles')
         unique_domains = cursor.fetchone()[0]
         
-        conn.close()
-        
         return {
             'total_articles': total_articles,
             'total_comments': total_comments,
@@ -307,12 +318,15 @@ def main():
     """Run the daily scraper."""
     scraper = HNScraper()
     
-    # Run daily scrape with fewer articles to avoid duplicates
-    results = scraper.scrape_daily(max_articles=15, max_comments_per_article=50)
-    
-    # Print stats
-    stats = scraper.get_stats()
-    print(f"\nDatabase Stats: {stats}")
+    try:
+        # Run daily scrape with fewer articles to avoid duplicates
+        results = scraper.scrape_daily(max_articles=15, max_comments_per_article=50)
+        
+        # Print stats
+        stats = scraper.get_stats()
+        print(f"\nDatabase Stats: {stats}")
+    finally:
+        scraper.close()
 
 if __name__ == "__main__":
     main()
@@ -7,9 +7,11 @@ Includes progress bars, cost-optimized comment storage, and end-to-end testing
 import requests
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
 from dynamodb_manager import DynamoDBManager
 from dotenv import load_dotenv
 import sys
@@ -18,6 +20,13 @@ import os
 # Load environment variables
 load_dotenv()
 
+# Comment items fetched in parallel per round; the session's connection pool
+# is sized to match so workers don't wait on each other for sockets
+FETCH_WORKERS = 16
+
+# HTML tags stripped from HN comment and story text
+_TAG_RE = re.compile(r'<[^>]+>')
+
 class ProgressTracker:
     """Simple progress tracker for terminal output."""
     
@@ -62,6 +71,8 @@ class OptimizedHNScraper:
         self.base_url = "https://hacker-news.firebaseio.com/v0"
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': 'HN-Scraper/1.0'})
+        self.session.mount('https://', HTTPAdapter(pool_maxsize=FETCH_WORKERS))
+        self.fetch_pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
         
         # Optimization settings
         self.max_articles_per_run = 50  # Limit articles per run
@@ -99,6 +110,11 @@ class OptimizedHNScraper:
             print(f"❌ Error fetching item {item_id}: {e}")
             return None
     
+    def fetch_items(self, item_ids: List[int]) -> Dict[int, Dict]:
+        """Fetch several items concurrently, dropping failures."""
+        results = self.fetch_pool.map(self.get_item_data, item_ids)
+        return {item_id: data for item_id, data in zip(item_ids, results) if data}
+    
     def extract_domain(self, url: str) -> str:
         """Extract domain from URL."""
         try:
@@ -118,7 +134,7 @@ class OptimizedHNScraper:
         if not text:
             return ''
         # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
+        text = _TAG_RE.sub('', text)
         # Decode HTML entities
         text = text.replace('&gt;', '>').replace('&lt;', '<')
         text = text.replace('&amp;', '&').replace('&quot;', '"')
@@ -151,12 +167,17 @@ class OptimizedHNScraper:
         comments_to_process = min(len(comment_ids), self.max_comments_per_article)
         
         # Only process top-level comments initially to stay within limits
-        for i, comment_id in enumerate(comment_ids[:comments_to_process]):
+        top_ids = comment_ids[:comments_to_process]
+        
+        # Fetch the top-level comments in one concurrent round
+        fetched = self.fetch_items(top_ids)
+        
+        for comment_id in top_ids:
             if comments_scraped >= self.max_comments_per_article:
                 break
                 
             try:
-                comment_data = self.get_item_data(comment_id)
+                comment_data = fetched.get(comment_id)
                 if not comment_data:
                     continue
                 
@@ -177,12 +198,14 @@ class OptimizedHNScraper:
                         comments_scraped += 1
                 
                 # Process one level of replies for popular comments (score > 5)
-                if comment_data.get('score', 0) > 5 and comment_data.get('kids'):
-                    for reply_id in comment_data['kids'][:5]:  # Max 5 replies per comment
-                        if comments_scraped >= self.max_comments_per_article:
-                            break
-                            
-                        reply_data = self.get_item_data(reply_id)
+                # (max 5, and no more than the comment budget has room for),
+                # fetched together in one concurrent round
+                remaining = self.max_comments_per_article - comments_scraped
+                if comment_data.get('score', 0) > 5 and comment_data.get('kids') and remaining > 0:
+                    kids = comment_data['kids'][:min(5, remaining)]
+                    fetched_replies = self.fetch_items(kids)
+                    for reply_id in kids:
+                        reply_data = fetched_replies.get(reply_id)
                         if reply_data and self.should_store_comment(reply_data, 1):
                             reply = {
                                 'comment_id': str(reply_id),
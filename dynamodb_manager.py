@@ -7,20 +7,91 @@ Provides persistent storage for articles and comments using AWS DynamoDB
 import boto3
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from datetime import datetime
 from typing import Dict, List, Optional
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+# Keep-alive connections sized for the migrator's thread pool; adaptive
+# retries back off on throttling
+BOTO_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=32,
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    connect_timeout=3,
+    read_timeout=10
+)
+
+# Parallel segments for full-table ID scans
+SCAN_SEGMENTS = 4
+
+# Concurrent per-article comment queries
+QUERY_WORKERS = 8
+
+# Key schemas shared by create_table and S3 Import Table
+ARTICLES_TABLE_SCHEMA = {
+    'KeySchema': [
+        {'AttributeName': 'hn_id', 'KeyType': 'HASH'}  # Partition key
+    ],
+    'AttributeDefinitions': [
+        {'AttributeName': 'hn_id', 'AttributeType': 'S'},
+        {'AttributeName': 'score', 'AttributeType': 'N'},
+        {'AttributeName': 'scraped_at', 'AttributeType': 'S'}
+    ],
+    'GlobalSecondaryIndexes': [
+        {
+            'IndexName': 'score-index',
+            'KeySchema': [{'AttributeName': 'score', 'KeyType': 'HASH'}],
+            'Projection': {'ProjectionType': 'ALL'}
+        },
+        {
+            'IndexName': 'scraped-at-index',
+            'KeySchema': [{'AttributeName': 'scraped_at', 'KeyType': 'HASH'}],
+            'Projection': {'ProjectionType': 'ALL'}
+        }
+    ],
+    'BillingMode': 'PAY_PER_REQUEST'
+}
+
+COMMENTS_TABLE_SCHEMA = {
+    'KeySchema': [
+        {'AttributeName': 'comment_id', 'KeyType': 'HASH'}  # Partition key
+    ],
+    'AttributeDefinitions': [
+        {'AttributeName': 'comment_id', 'AttributeType': 'S'},
+        {'AttributeName': 'article_id', 'AttributeType': 'S'}
+    ],
+    'GlobalSecondaryIndexes': [
+        {
+            'IndexName': 'article-id-index',
+            'KeySchema': [{'AttributeName': 'article_id', 'KeyType': 'HASH'}],
+            'Projection': {'ProjectionType': 'ALL'}
+        }
+    ],
+    'BillingMode': 'PAY_PER_REQUEST'
+}
+
+def _serialize_item(item: Dict) -> Dict:
+    """Convert a plain item to the low-level client's attribute-value form."""
+    serializer = TypeSerializer()
+    return {key: serializer.serialize(value) for key, value in item.items()}
+
 class DynamoDBManager:
     """DynamoDB database manager for HN articles and comments."""
     
-    def __init__(self):
-        # Initialize DynamoDB client
-        self.dynamodb = boto3.resource(
+    def __init__(self, session: boto3.session.Session = None):
+        # Initialize DynamoDB client; boto3.resource reuses boto3's
+        # process-wide default session unless one is passed in
+        self.dynamodb = (session or boto3).resource(
             'dynamodb',
             aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
             aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.environ.get('AWS_REGION', 'us-west-2')
+            region_name=os.environ.get('AWS_REGION', 'us-west-2'),
+            config=BOTO_CONFIG
         )
         
         # Table names (matching your existing tables)
@@ -70,55 +141,7 @@ class DynamoDBManager:
         """Create the articles table."""
         table = self.dynamodb.create_table(
             TableName=self.articles_table_name,
-            KeySchema=[
-                {
-                    'AttributeName': 'hn_id',
-                    'KeyType': 'HASH'  # Partition key
-                }
-            ],
-            AttributeDefinitions=[
-                {
-                    'AttributeName': 'hn_id',
-                    'AttributeType': 'S'
-                },
-                {
-                    'AttributeName': 'score',
-                    'AttributeType': 'N'
-                },
-                {
-                    'AttributeName': 'scraped_at',
-                    'AttributeType': 'S'
-                }
-            ],
-            GlobalSecondaryIndexes=[
-                {
-                    'IndexName': 'score-index',
-                    'KeySchema': [
-                        {
-                            'AttributeName': 'score',
-                            'KeyType': 'HASH'
-                        }
-                    ],
-                    'Projection': {
-                        'ProjectionType': 'ALL'
-                    },
-                    'BillingMode': 'PAY_PER_REQUEST'
-                },
-                {
-                    'IndexName': 'scraped-at-index',
-                    'KeySchema': [
-                        {
-                            'AttributeName': 'scraped_at',
-                            'KeyType': 'HASH'
-                        }
-                    ],
-                    'Projection': {
-                        'ProjectionType': 'ALL'
-                    },
-                    'BillingMode': 'PAY_PER_REQUEST'
-                }
-            ],
-            BillingMode='PAY_PER_REQUEST'
+            **ARTICLES_TABLE_SCHEMA
         )
         
         # Wait for table to be created
@@ -129,38 +152,7 @@ class DynamoDBManager:
         """Create the comments table."""
         table = self.dynamodb.create_table(
             TableName=self.comments_table_name,
-            KeySchema=[
-                {
-                    'AttributeName': 'comment_id',
-                    'KeyType': 'HASH'  # Partition key
-                }
-            ],
-            AttributeDefinitions=[
-                {
-                    'AttributeName': 'comment_id',
-                    'AttributeType': 'S'
-                },
-                {
-                    'AttributeName': 'article_id',
-                    'AttributeType': 'S'
-                }
-            ],
-            GlobalSecondaryIndexes=[
-                {
-                    'IndexName': 'article-id-index',
-                    'KeySchema': [
-                        {
-                            'AttributeName': 'article_id',
-                            'KeyType': 'HASH'
-                        }
-                    ],
-                    'Projection': {
-                        'ProjectionType': 'ALL'
-                    },
-                    'BillingMode': 'PAY_PER_REQUEST'
-                }
-            ],
-            BillingMode='PAY_PER_REQUEST'
+            **COMMENTS_TABLE_SCHEMA
         )
         
         # Wait for table to be created
@@ -199,25 +191,56 @@ class DynamoDBManager:
         """Save comment to DynamoDB (alias for insert_comment)."""
         return self.insert_comment(comment_data)
     
+    @staticmethod
+    def _article_item(article_data: Dict) -> Dict:
+        """Prepare an article dict for DynamoDB."""
+        return {
+            'hn_id': str(article_data['hn_id']),
+            'title': article_data.get('title', ''),
+            'url': article_data.get('url', ''),
+            'domain': article_data.get('domain', ''),
+            'score': int(article_data.get('score', 0)),
+            'author': article_data.get('author', 'unknown'),
+            'time_posted': int(article_data.get('time_posted', 0)),
+            'num_comments': int(article_data.get('num_comments', 0)),
+            'story_text': article_data.get('story_text', ''),
+            'story_type': article_data.get('story_type', 'story'),
+            'scraped_at': article_data.get('scraped_at', datetime.now().isoformat())
+        }
+    
+    @staticmethod
+    def _comment_item(comment_data: Dict) -> Dict:
+        """Prepare a comment dict for DynamoDB."""
+        return {
+            'comment_id': str(comment_data['comment_id']),
+            'article_id': str(comment_data['article_id']),
+            'parent_id': str(comment_data.get('parent_id', '')),
+            'author': comment_data.get('author', 'unknown'),
+            'content': comment_data.get('content', ''),
+            'time_posted': int(comment_data.get('time_posted', 0)),
+            'level': int(comment_data.get('level', 0)),
+            'scraped_at': comment_data.get('scraped_at', datetime.now().isoformat())
+        }
+    
+    @staticmethod
+    def _analysis_item(analysis_data: Dict) -> Dict:
+        """Prepare an article analysis dict for DynamoDB."""
+        return {
+            'hn_id': str(analysis_data['hn_id']),
+            'title': analysis_data.get('title', ''),
+            'url': analysis_data.get('url', ''),
+            'domain': analysis_data.get('domain', ''),
+            'summary': analysis_data.get('summary', ''),
+            'generated_at': analysis_data.get('generated_at', datetime.now().isoformat())
+        }
+    
     def insert_article(self, article_data: Dict) -> bool:
-        """Insert or update an article."""
+        """Insert or update an article (thread-safe: goes through the low-level client)."""
         try:
-            # Prepare item for DynamoDB
-            item = {
-                'hn_id': str(article_data['hn_id']),
-                'title': article_data.get('title', ''),
-                'url': article_data.get('url', ''),
-                'domain': article_data.get('domain', ''),
-                'score': int(article_data.get('score', 0)),
-                'author': article_data.get('author', 'unknown'),
-                'time_posted': int(article_data.get('time_posted', 0)),
-                'num_comments': int(article_data.get('num_comments', 0)),
-                'story_text': article_data.get('story_text', ''),
-                'story_type': article_data.get('story_type', 'story'),
-                'scraped_at': article_data.get('scraped_at', datetime.now().isoformat())
-            }
-            
-            self.articles_table.put_item(Item=item)
+            self.dynamodb.meta.client.put_item(
+                TableName=self.articles_table_name,
+                Item=_serialize_item(self._article_item(article_data))
+            )
             return True
         except Exception as e:
             print(f"Error inserting article {article_data.get('hn_id')}: {e}")
@@ -226,19 +249,7 @@ class DynamoDBManager:
     def insert_comment(self, comment_data: Dict) -> bool:
         """Insert or update a comment."""
         try:
-            # Prepare item for DynamoDB
-            item = {
-                'comment_id': str(comment_data['comment_id']),
-                'article_id': str(comment_data['article_id']),
-                'parent_id': str(comment_data.get('parent_id', '')),
-                'author': comment_data.get('author', 'unknown'),
-                'content': comment_data.get('content', ''),
-                'time_posted': int(comment_data.get('time_posted', 0)),
-                'level': int(comment_data.get('level', 0)),
-                'scraped_at': comment_data.get('scraped_at', datetime.now().isoformat())
-            }
-            
-            self.comments_table.put_item(Item=item)
+            self.comments_table.put_item(Item=self._comment_item(comment_data))
             return True
         except Exception as e:
             print(f"Error inserting comment {comment_data.get('comment_id')}: {e}")
@@ -247,56 +258,101 @@ class DynamoDBManager:
     def insert_analysis(self, analysis_data: Dict) -> bool:
         """Insert or update an article analysis."""
         try:
-            # Prepare item for DynamoDB
-            item = {
-                'hn_id': str(analysis_data['hn_id']),
-                'title': analysis_data.get('title', ''),
-                'url': analysis_data.get('url', ''),
-                'domain': analysis_data.get('domain', ''),
-                'summary': analysis_data.get('summary', ''),
-                'generated_at': analysis_data.get('generated_at', datetime.now().isoformat())
-            }
-            
-            self.analyses_table.put_item(Item=item)
+            self.analyses_table.put_item(Item=self._analysis_item(analysis_data))
             return True
         except Exception as e:
             print(f"Error inserting analysis {analysis_data.get('hn_id')}: {e}")
             return False
     
+    def _batch_write(self, table_name: str, records: List[Dict], to_item, pkeys: List[str]) -> bool:
+        """Write records with BatchWriteItem (25 per request, unprocessed items retried).
+        
+        Goes through the low-level client, which is thread-safe, so worker
+        threads can share one manager.
+        """
+        client = self.dynamodb.meta.client
+        try:
+            # A request may not repeat a key, so the last record for each key wins
+            items = list({
+                tuple(item[key] for key in pkeys): item for item in map(to_item, records)
+            }.values())
+            for start in range(0, len(items), 25):
+                request = {table_name: [
+                    {'PutRequest': {'Item': _serialize_item(item)}}
+                    for item in items[start:start + 25]
+                ]}
+                while request:
+                    response = client.batch_write_item(RequestItems=request)
+                    request = response.get('UnprocessedItems')
+            return True
+        except Exception as e:
+            print(f"Error batch writing {len(records)} items to {table_name}: {e}")
+            return False
+    
+    def batch_write_articles(self, articles: List[Dict]) -> bool:
+        """Insert or update many articles in batched requests."""
+        return self._batch_write(self.articles_table_name, articles, self._article_item, ['hn_id'])
+    
+    def batch_write_comments(self, comments: List[Dict]) -> bool:
+        """Insert or update many comments in batched requests."""
+        return self._batch_write(self.comments_table_name, comments, self._comment_item, ['comment_id'])
+    
+    def batch_write_analyses(self, analyses: List[Dict]) -> bool:
+        """Insert or update many article analyses in batched requests."""
+        return self._batch_write(self.analyses_table_name, analyses, self._analysis_item, ['hn_id'])
+    
     def save_analysis(self, analysis_data: Dict) -> bool:
         """Save analysis to DynamoDB (alias for insert_analysis)."""
         return self.insert_analysis(analysis_data)
     
-    def get_articles(self, limit: int = 50, sort_by: str = 'score') -> List[Dict]:
-        """Get articles with sorting."""
+    @staticmethod
+    def _iter_items(operation, **kwargs):
+        """Yield items from a Scan or Query, fetching each page only when it's reached."""
+        while True:
+            response = operation(**kwargs)
+            yield from response.get('Items', [])
+            
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return
+            kwargs['ExclusiveStartKey'] = last_key
+    
+    def iter_articles(self, page_size: int = 100, consistent_read: bool = False):
+        """Yield articles in table order, one scan page at a time."""
+        return self._iter_items(self.articles_table.scan, Limit=page_size, ConsistentRead=consistent_read)
+    
+    def get_articles(self, limit: int = 50, sort_by: str = 'score', consistent_read: bool = False) -> List[Dict]:
+        """Get articles with sorting.
+        
+        Reads are eventually consistent (half the read capacity) unless
+        consistent_read is set for read-after-write checks.
+        """
         try:
-            if sort_by == 'score':
-                # Scan and sort by score (in a real app, you'd use a GSI)
-                response = self.articles_table.scan(
-                    Limit=limit * 2  # Get more to sort
-                )
-                items = response.get('Items', [])
-                items.sort(key=lambda x: int(x.get('score', 0)), reverse=True)
-                return items[:limit]
+            # Get more to sort; the default order needs only the first page
+            fetch = limit * 2 if sort_by in ('score', 'recent') else limit
+            items = [
+                self._article_from_item(item)
+                for item in islice(self.iter_articles(page_size=fetch, consistent_read=consistent_read), fetch)
+            ]
             
+            if sort_by == 'score':
+                # Sort by score (in a real app, you'd use a GSI)
+                items.sort(key=lambda x: x['score'], reverse=True)
             elif sort_by == 'recent':
-                # Scan and sort by scraped_at
-                response = self.articles_table.scan(
-                    Limit=limit * 2
-                )
-                items = response.get('Items', [])
                 items.sort(key=lambda x: x.get('scraped_at', ''), reverse=True)
-                return items[:limit]
+            return items[:limit]
             
-            else:
-                # Default scan
-                response = self.articles_table.scan(Limit=limit)
-                return response.get('Items', [])
-                
         except Exception as e:
             print(f"Error getting articles: {e}")
             return []
     
+    @staticmethod
+    def _article_from_item(item: Dict) -> Dict:
+        """Cast an article item's counters from Decimal to int once, in place."""
+        item['score'] = int(item.get('score', 0))
+        item['num_comments'] = int(item.get('num_comments', 0))
+        return item
+    
     def get_article(self, hn_id: str) -> Optional[Dict]:
         """Get a single article by ID."""
         try:
@@ -308,37 +364,102 @@ class DynamoDBManager:
             print(f"Error getting article {hn_id}: {e}")
             return None
     
-    def get_article_comments(self, article_id: str) -> List[Dict]:
-        """Get all comments for an article."""
+    @staticmethod
+    def _comment_query_args(article_id: str, min_length: int = None, projection: List[str] = None) -> Dict:
+        """Build Query arguments for an article's comments.
+        
+        min_length drops shorter comments server-side and projection limits
+        the attributes returned. Filtered items still consume read capacity,
+        but they never cross the wire. Reads are eventually consistent, the
+        only mode a GSI supports.
+        """
+        args = {
+            'IndexName': 'article-id-index',
+            'KeyConditionExpression': 'article_id = :article_id',
+            'ExpressionAttributeValues': {':article_id': str(article_id)},
+            'ConsistentRead': False
+        }
+        names = {}
+        
+        if min_length is not None:
+            names['#content'] = 'content'
+            args['FilterExpression'] = 'size(#content) > :min_length'
+            args['ExpressionAttributeValues'][':min_length'] = min_length
+        
+        if projection:
+            # Placeholders sidestep reserved words such as "level"
+            placeholders = {f'#p{i}': attr for i, attr in enumerate(projection)}
+            names.update(placeholders)
+            args['ProjectionExpression'] = ', '.join(placeholders)
+        
+        if names:
+            args['ExpressionAttributeNames'] = names
+        return args
+    
+    def get_article_comments(self, article_id: str, min_length: int = None,
+                             projection: List[str] = None) -> List[Dict]:
+        """Get all comments for an article, optionally filtered and projected."""
         try:
-            # Use the article-id-index GSI for efficient lookup
-            response = self.comments_table.query(
-                IndexName='article-id-index',
-                KeyConditionExpression='article_id = :article_id',
-                ExpressionAttributeValues={
-                    ':article_id': str(article_id)
-                }
+            # Use the article-id-index GSI for efficient lookup, following
+            # pages past the 1MB Query limit
+            items = self._iter_items(
+                self.comments_table.query,
+                **self._comment_query_args(article_id, min_length, projection)
             )
             
             # Convert DynamoDB items to regular dicts and handle Decimal types
-            comments = []
-            for item in response.get('Items', []):
-                comment = {
-                    'comment_id': item.get('comment_id', ''),
-                    'article_id': item.get('article_id', ''),
-                    'parent_id': item.get('parent_id', ''),
-                    'author': item.get('author', ''),
-                    'content': item.get('content', ''),
-                    'time_posted': int(item.get('time_posted', 0)),
-                    'level': int(item.get('level', 0))
-                }
-                comments.append(comment)
-            
-            return comments
+            return [self._comment_from_item(item) for item in items]
         except Exception as e:
             print(f"Error getting comments for article {article_id}: {e}")
             return []
     
+    def batch_get_article_comments(self, article_ids: List[str], min_length: int = None,
+                                   projection: List[str] = None) -> Dict[str, List[Dict]]:
+        """Get comments for several articles with concurrent index queries.
+        
+        Comments are only reachable through the article-id-index GSI, which
+        BatchGetItem can't read, so the per-article Queries are overlapped
+        instead. They go through the low-level client, which is thread-safe.
+        """
+        client = self.dynamodb.meta.client
+        serializer = TypeSerializer()
+        deserializer = TypeDeserializer()
+        
+        def query_article(article_id: str) -> List[Dict]:
+            args = self._comment_query_args(article_id, min_length, projection)
+            args['ExpressionAttributeValues'] = {
+                k: serializer.serialize(v) for k, v in args['ExpressionAttributeValues'].items()
+            }
+            try:
+                items = self._iter_items(client.query, TableName=self.comments_table_name, **args)
+                return [
+                    self._comment_from_item({k: deserializer.deserialize(v) for k, v in item.items()})
+                    for item in items
+                ]
+            except Exception as e:
+                print(f"Error getting comments for article {article_id}: {e}")
+                return []
+        
+        article_ids = [str(article_id) for article_id in article_ids]
+        if not article_ids:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(QUERY_WORKERS, len(article_ids))) as executor:
+            return dict(zip(article_ids, executor.map(query_article, article_ids)))
+    
+    @staticmethod
+    def _comment_from_item(item: Dict) -> Dict:
+        """Convert a comments table item to a plain comment dict."""
+        return {
+            'comment_id': item.get('comment_id', ''),
+            'article_id': item.get('article_id', ''),
+            'parent_id': item.get('parent_id', ''),
+            'author': item.get('author', ''),
+            'content': item.get('content', ''),
+            'time_posted': int(item.get('time_posted', 0)),
+            'level': int(item.get('level', 0))
+        }
+    
     def get_analysis(self, hn_id: str) -> Optional[Dict]:
         """Get analysis for an article."""
         try:
@@ -351,10 +472,11 @@ class DynamoDBManager:
             return None
     
     def article_exists(self, hn_id: str) -> bool:
-        """Check if an article already exists."""
+        """Check if an article already exists (thread-safe: goes through the low-level client)."""
         try:
-            response = self.articles_table.get_item(
-                Key={'hn_id': str(hn_id)},
+            response = self.dynamodb.meta.client.get_item(
+                TableName=self.articles_table_name,
+                Key={'hn_id': {'S': str(hn_id)}},
                 ProjectionExpression='hn_id'
             )
             return 'Item' in response
@@ -362,36 +484,72 @@ class DynamoDBManager:
             print(f"Error checking article existence {hn_id}: {e}")
             return False
     
-    def get_existing_article_ids(self) -> set:
-        """Get all existing article IDs."""
+    def filter_existing_article_ids(self, hn_ids: List[str]) -> set:
+        """Return which of the given article IDs are stored, 100 keys per BatchGetItem."""
+        existing = set()
+        hn_ids = list(dict.fromkeys(str(hn_id) for hn_id in hn_ids))
         try:
-            response = self.articles_table.scan(
-                ProjectionExpression='hn_id'
-            )
-            return {item['hn_id'] for item in response.get('Items', [])}
+            for start in range(0, len(hn_ids), 100):
+                request = {self.articles_table_name: {
+                    'Keys': [{'hn_id': hn_id} for hn_id in hn_ids[start:start + 100]],
+                    'ProjectionExpression': 'hn_id'
+                }}
+                while request:
+                    response = self.dynamodb.batch_get_item(RequestItems=request)
+                    existing.update(
+                        item['hn_id'] for item in response.get('Responses', {}).get(self.articles_table_name, [])
+                    )
+                    request = response.get('UnprocessedKeys')
+            return existing
+        except Exception as e:
+            print(f"Error checking existing articles: {e}")
+            return set()
+    
+    def get_existing_article_ids(self, segments: int = SCAN_SEGMENTS) -> set:
+        """Get all existing article IDs with a paginated, segmented parallel scan."""
+        # The low-level client is thread-safe, unlike the resource Table
+        paginator = self.dynamodb.meta.client.get_paginator('scan')
+        
+        def scan_segment(segment: int) -> set:
+            ids = set()
+            for page in paginator.paginate(
+                TableName=self.articles_table_name,
+                ProjectionExpression='hn_id',
+                Segment=segment,
+                TotalSegments=segments
+            ):
+                ids.update(item['hn_id']['S'] for item in page.get('Items', []))
+            return ids
+        
+        try:
+            with ThreadPoolExecutor(max_workers=segments) as executor:
+                return set().union(*executor.map(scan_segment, range(segments)))
         except Exception as e:
             print(f"Error getting existing article IDs: {e}")
             return set()
     
-    def get_stats(self) -> Dict:
+    def get_stats(self, consistent_read: bool = False) -> Dict:
         """Get database statistics."""
         try:
             # Count articles
             articles_response = self.articles_table.scan(
-                Select='COUNT'
+                Select='COUNT',
+                ConsistentRead=consistent_read
             )
             total_articles = articles_response.get('Count', 0)
             
             # Count comments
             comments_response = self.comments_table.scan(
-                Select='COUNT'
+                Select='COUNT',
+                ConsistentRead=consistent_read
             )
             total_comments = comments_response.get('Count', 0)
             
             # Get average score (simple approach - in production you'd use aggregation)
             if total_articles > 0:
                 articles_response = self.articles_table.scan(
-                    ProjectionExpression='score'
+                    ProjectionExpression='score',
+                    ConsistentRead=consistent_read
                 )
                 scores = [int(item.get('score', 0)) for item in articles_response.get('Items', [])]
                 avg_score = sum(scores) / len(scores) if scores else 0
@@ -401,7 +559,8 @@ class DynamoDBManager:
             # Get unique domains (using expression attribute names for reserved keyword)
             domains_response = self.articles_table.scan(
                 ProjectionExpression='#d',
-                ExpressionAttributeNames={'#d': 'domain'}
+                ExpressionAttributeNames={'#d': 'domain'},
+                ConsistentRead=consistent_read
             )
             domains = set(item.get('domain', '') for item in domains_response.get('Items', []))
             unique_domains = len(domains)
@@ -512,6 +671,12 @@ class DynamoDBManager:
             return []
     
 
+@lru_cache(maxsize=1)
+def get_dynamo() -> DynamoDBManager:
+    """Return the process-wide DynamoDBManager, connecting on first use."""
+    return DynamoDBManager()
+
+
 def test_connection():
     """Test DynamoDB connection."""
     try:
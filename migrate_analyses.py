@@ -11,6 +11,9 @@ from dynamodb_manager import DynamoDBManager
 
 load_dotenv()
 
+# Analyses handed to each batch write (BatchWriteItem splits these into 25s)
+MIGRATE_BATCH_SIZE = 100
+
 def migrate_analyses_from_backup():
     """Migrate article analyses from backup database to DynamoDB."""
     backup_file = "enhanced_hn_articles.db.backup_20250624_172537"
@@ -40,14 +43,18 @@ def migrate_analyses_from_backup():
             print("✅ No analyses to migrate")
             return True
         
-        # Migrate analyses
+        # Migrate analyses, streaming one batch of rows at a time
         cursor.execute("SELECT * FROM article_analyses")
         migrated = 0
         errors = 0
         
-        for row in cursor.fetchall():
-            try:
-                analysis_data = {
+        while True:
+            rows = cursor.fetchmany(MIGRATE_BATCH_SIZE)
+            if not rows:
+                break
+            
+            batch = [
+                {
                     'hn_id': row['hn_id'],
                     'title': row['title'] or '',
                     'url': row['url'] or '',
@@ -55,18 +62,14 @@ def migrate_analyses_from_backup():
                     'summary': row['summary'] or '',
                     'generated_at': row['generated_at'] or datetime.now().isoformat()
                 }
-                
-                if db.insert_analysis(analysis_data):
-                    migrated += 1
-                    if migrated % 10 == 0:
-                        print(f"   ✅ Migrated {migrated}/{total_count} analyses...")
-                else:
-                    errors += 1
-                    print(f"   ❌ Failed to migrate analysis for {row['hn_id']}")
-                    
-            except Exception as e:
-                errors += 1
-                print(f"   ❌ Error migrating analysis {row['hn_id']}: {e}")
+                for row in rows
+            ]
+            if db.batch_write_analyses(batch):
+                migrated += len(batch)
+                print(f"   ✅ Migrated {migrated}/{total_count} analyses...")
+            else:
+                errors += len(batch)
+                print(f"   ❌ Failed to migrate analyses {batch[0]['hn_id']}..{batch[-1]['hn_id']}")
         
         conn.close()
         
@@ -4,22 +4,73 @@ Migrate data from SQLite to DynamoDB
 Transfers articles, comments, and analyses from enhanced_hn_articles.db to AWS DynamoDB
 """
 
+import argparse
+import gzip
+import json
 import sqlite3
 import os
 import sys
+import tempfile
+import boto3
+from boto3.dynamodb.types import TypeSerializer
+from boto3.s3.transfer import TransferConfig
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
+from itertools import islice
 from dotenv import load_dotenv
-from dynamodb_manager import DynamoDBManager
+from dynamodb_manager import (
+    ARTICLES_TABLE_SCHEMA, BOTO_CONFIG, COMMENTS_TABLE_SCHEMA, DynamoDBManager, get_dynamo
+)
 
 # Load environment variables
 load_dotenv()
 
+# DynamoDB BatchWriteItem accepts at most 25 items per request
+BATCH_WRITE_SIZE = 25
+
+# Concurrent BatchWriteItem requests during comment migration
+MIGRATION_WORKERS = 8
+
+# Comment migration progress is printed every this many comments
+PROGRESS_EVERY = 100
+
+# Rows pulled per fetchmany() while spooling an S3 import file
+EXPORT_FETCH_SIZE = 1000
+
+# Only the columns the DynamoDB items need, in the order the record
+# helpers unpack them
+ARTICLES_QUERY = (
+    "SELECT hn_id, title, url, domain, score, author, time_posted, num_comments, "
+    "story_text, story_type, scraped_at FROM articles"
+)
+COMMENTS_QUERY = (
+    "SELECT comment_id, article_id, parent_id, author, content, time_posted, level, "
+    "scraped_at FROM comments"
+)
+ANALYSES_QUERY = "SELECT hn_id, title, url, domain, summary, generated_at FROM article_analyses"
+
+# Backups above 8MB go to S3 as parallel multipart uploads
+BACKUP_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True
+)
+
+def _batched(iterable, n=BATCH_WRITE_SIZE):
+    """Yield successive lists of up to n items from iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, n))
+        if not chunk:
+            return
+        yield chunk
+
 class SQLiteToDynamoDBMigrator:
     """Migrates data from SQLite to DynamoDB."""
     
     def __init__(self, sqlite_db_path: str):
         self.sqlite_db_path = sqlite_db_path
-        self.dynamo_db = DynamoDBManager()
+        self.dynamo_db = get_dynamo()
         self.migration_stats = {
             'articles_migrated': 0,
             'comments_migrated': 0,
@@ -35,7 +86,6 @@ class SQLiteToDynamoDBMigrator:
             raise FileNotFoundError(f"SQLite database not found: {self.sqlite_db_path}")
         
         self.sqlite_conn = sqlite3.connect(self.sqlite_db_path)
-        self.sqlite_conn.row_factory = sqlite3.Row  # Enable column access by name
         print(f"✅ Connected to SQLite database: {self.sqlite_db_path}")
     
     def get_sqlite_stats(self):
@@ -55,48 +105,79 @@ class SQLiteToDynamoDBMigrator:
         
         return stats
     
+    @staticmethod
+    def _article_record(row) -> dict:
+        """Map an ARTICLES_QUERY row to the DynamoDBManager article format."""
+        (hn_id, title, url, domain, score, author, time_posted, num_comments,
+         story_text, story_type, scraped_at) = row
+        return {
+            'hn_id': hn_id,
+            'title': title or '',
+            'url': url or '',
+            'domain': domain or '',
+            'score': score or 0,
+            'author': author or 'unknown',
+            'time_posted': time_posted or 0,
+            'num_comments': num_comments or 0,
+            'story_text': story_text or '',
+            'story_type': story_type or 'story',
+            'scraped_at': scraped_at or datetime.now().isoformat()
+        }
+    
+    @staticmethod
+    def _comment_record(row) -> dict:
+        """Map a COMMENTS_QUERY row to the DynamoDBManager comment format."""
+        comment_id, article_id, parent_id, author, content, time_posted, level, scraped_at = row
+        return {
+            'comment_id': comment_id,
+            'article_id': article_id,
+            'parent_id': parent_id or '',
+            'author': author or 'unknown',
+            'content': content or '',
+            'time_posted': time_posted or 0,
+            'level': level or 0,
+            'scraped_at': scraped_at or datetime.now().isoformat()
+        }
+    
     def migrate_articles(self):
         """Migrate articles from SQLite to DynamoDB."""
         print("\n📰 Migrating articles...")
         
+        # One scan up front instead of a GetItem per row
+        existing_ids = self.dynamo_db.get_existing_article_ids()
+        
         cursor = self.sqlite_conn.cursor()
-        cursor.execute("SELECT * FROM articles")
+        cursor.execute(ARTICLES_QUERY)
         
-        for row in cursor.fetchall():
-            try:
-                # Check if article already exists in DynamoDB
-                if self.dynamo_db.article_exists(row['hn_id']):
-                    print(f"   ⏭️  Article {row['hn_id']} already exists, skipping")
-                    self.migration_stats['articles_skipped'] += 1
-                    continue
-                
-                # Prepare article data for DynamoDB
-                article_data = {
-                    'hn_id': row['hn_id'],
-                    'title': row['title'] or '',
-                    'url': row['url'] or '',
-                    'domain': row['domain'] or '',
-                    'score': row['score'] or 0,
-                    'author': row['author'] or 'unknown',
-                    'time_posted': row['time_posted'] or 0,
-                    'num_comments': row['num_comments'] or 0,
-                    'story_text': row['story_text'] or '',
-                    'story_type': row['story_type'] or 'story',
-                    'scraped_at': row['scraped_at'] or datetime.now().isoformat()
-                }
-                
-                # Insert into DynamoDB
-                if self.dynamo_db.insert_article(article_data):
-                    self.migration_stats['articles_migrated'] += 1
-                    if self.migration_stats['articles_migrated'] % 10 == 0:
-                        print(f"   ✅ Migrated {self.migration_stats['articles_migrated']} articles...")
-                else:
-                    self.migration_stats['errors'].append(f"Failed to migrate article {row['hn_id']}")
+        for chunk in _batched(cursor):
+            articles = []
+            for row in chunk:
+                try:
+                    # Check if article already exists in DynamoDB
+                    if str(row[0]) in existing_ids:
+                        print(f"   ⏭️  Article {row[0]} already exists, skipping")
+                        self.migration_stats['articles_skipped'] += 1
+                        continue
                     
-            except Exception as e:
-                error_msg = f"Error migrating article {row['hn_id']}: {str(e)}"
-                self.migration_stats['errors'].append(error_msg)
-                print(f"   ❌ {error_msg}")
+                    # Prepare article data for DynamoDB
+                    articles.append(self._article_record(row))
+                    
+                except Exception as e:
+                    error_msg = f"Error migrating article {row[0]}: {str(e)}"
+                    self.migration_stats['errors'].append(error_msg)
+                    print(f"   ❌ {error_msg}")
+            
+            if not articles:
+                continue
+            
+            # Insert into DynamoDB in one batched request
+            if self.dynamo_db.batch_write_articles(articles):
+                self.migration_stats['articles_migrated'] += len(articles)
+                print(f"   ✅ Migrated {self.migration_stats['articles_migrated']} articles...")
+            else:
+                self.migration_stats['errors'].append(
+                    f"Failed to migrate articles {articles[0]['hn_id']}..{articles[-1]['hn_id']}"
+                )
         
         print(f"✅ Articles migration complete: {self.migration_stats['articles_migrated']} migrated, {self.migration_stats['articles_skipped']} skipped")
     
@@ -105,83 +186,95 @@ class SQLiteToDynamoDBMigrator:
         print("\n💬 Migrating comments...")
         
         cursor = self.sqlite_conn.cursor()
-        cursor.execute("SELECT * FROM comments")
-        
-        batch_size = 100
-        comment_count = 0
+        cursor.execute(COMMENTS_QUERY)
         
-        for row in cursor.fetchall():
-            try:
-                # Prepare comment data for DynamoDB
-                comment_data = {
-                    'comment_id': row['comment_id'],
-                    'article_id': row['article_id'],
-                    'parent_id': row['parent_id'] or '',
-                    'author': row['author'] or 'unknown',
-                    'content': row['content'] or '',
-                    'time_posted': row['time_posted'] or 0,
-                    'level': row['level'] or 0,
-                    'scraped_at': row['scraped_at'] or datetime.now().isoformat()
-                }
+        # Keep a bounded number of batches in flight so writes overlap;
+        # batch_write_comments uses the thread-safe low-level client
+        pending = {}
+        with ThreadPoolExecutor(max_workers=MIGRATION_WORKERS) as executor:
+            for chunk in _batched(cursor):
+                comments = []
+                for row in chunk:
+                    try:
+                        # Prepare comment data for DynamoDB
+                        comments.append(self._comment_record(row))
+                        
+                    except Exception as e:
+                        error_msg = f"Error migrating comment {row[0]}: {str(e)}"
+                        self.migration_stats['errors'].append(error_msg)
+                        if len(self.migration_stats['errors']) <= 5:  # Only print first few errors
+                            print(f"   ❌ {error_msg}")
                 
-                # Insert into DynamoDB
-                if self.dynamo_db.insert_comment(comment_data):
-                    comment_count += 1
-                    self.migration_stats['comments_migrated'] += 1
-                    
-                    if comment_count % batch_size == 0:
-                        print(f"   ✅ Migrated {comment_count} comments...")
-                else:
-                    self.migration_stats['errors'].append(f"Failed to migrate comment {row['comment_id']}")
-                    
-            except Exception as e:
-                error_msg = f"Error migrating comment {row['comment_id']}: {str(e)}"
-                self.migration_stats['errors'].append(error_msg)
-                if len(self.migration_stats['errors']) <= 5:  # Only print first few errors
-                    print(f"   ❌ {error_msg}")
+                if not comments:
+                    continue
+                
+                future = executor.submit(self.dynamo_db.batch_write_comments, comments)
+                pending[future] = comments
+                
+                if len(pending) >= MIGRATION_WORKERS * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._record_comment_batch(pending.pop(future), future.result())
+            
+            for future in list(pending):
+                self._record_comment_batch(pending.pop(future), future.result())
         
         print(f"✅ Comments migration complete: {self.migration_stats['comments_migrated']} migrated")
     
+    def _record_comment_batch(self, comments, success: bool):
+        """Update migration stats for a finished comment batch."""
+        if not success:
+            self.migration_stats['errors'].append(
+                f"Failed to migrate comments {comments[0]['comment_id']}..{comments[-1]['comment_id']}"
+            )
+            return
+        
+        previous = self.migration_stats['comments_migrated']
+        self.migration_stats['comments_migrated'] += len(comments)
+        
+        if self.migration_stats['comments_migrated'] // PROGRESS_EVERY > previous // PROGRESS_EVERY:
+            print(f"   ✅ Migrated {self.migration_stats['comments_migrated']} comments...")
+    
     def migrate_article_analyses(self):
         """Migrate article analyses to the new DynamoDB analyses table."""
         print("\n🔍 Migrating article analyses to DynamoDB...")
         
         cursor = self.sqlite_conn.cursor()
         try:
-            cursor.execute("SELECT COUNT(*) FROM article_analyses")
-            count = cursor.fetchone()[0]
+            # Rows are streamed straight from the cursor, one batch at a time
+            cursor.execute(ANALYSES_QUERY)
+            migrated = 0
+            errors = 0
             
-            if count > 0:
-                print(f"   📊 Found {count} article analyses to migrate")
-                
-                cursor.execute("SELECT * FROM article_analyses")
-                migrated = 0
-                errors = 0
-                
-                for row in cursor.fetchall():
+            for chunk in _batched(cursor):
+                analyses = []
+                for hn_id, title, url, domain, summary, generated_at in chunk:
                     try:
-                        analysis_data = {
-                            'hn_id': row['hn_id'],
-                            'title': row['title'] or '',
-                            'url': row['url'] or '',
-                            'domain': row['domain'] or '',
-                            'summary': row['summary'] or '',
-                            'generated_at': row['generated_at'] or datetime.now().isoformat()
-                        }
+                        analyses.append({
+                            'hn_id': hn_id,
+                            'title': title or '',
+                            'url': url or '',
+                            'domain': domain or '',
+                            'summary': summary or '',
+                            'generated_at': generated_at or datetime.now().isoformat()
+                        })
                         
-                        if self.dynamo_db.insert_analysis(analysis_data):
-                            migrated += 1
-                            if migrated % 10 == 0:
-                                print(f"   ✅ Migrated {migrated} analyses...")
-                        else:
-                            errors += 1
-                            
                     except Exception as e:
-                        error_msg = f"Error migrating analysis {row['hn_id']}: {str(e)}"
+                        error_msg = f"Error migrating analysis {hn_id}: {str(e)}"
                         self.migration_stats['errors'].append(error_msg)
                         errors += 1
                 
-                self.migration_stats['analyses_migrated'] = migrated
+                if not analyses:
+                    continue
+                
+                if self.dynamo_db.batch_write_analyses(analyses):
+                    migrated += len(analyses)
+                    print(f"   ✅ Migrated {migrated} analyses...")
+                else:
+                    errors += len(analyses)
+            
+            self.migration_stats['analyses_migrated'] = migrated
+            if migrated or errors:
                 print(f"✅ Analyses migration complete: {migrated} migrated, {errors} errors")
             else:
                 print("   ✅ No article analyses to migrate")
@@ -189,6 +282,84 @@ class SQLiteToDynamoDBMigrator:
         except sqlite3.Error as e:
             print(f"   ❌ Could not migrate article analyses: {e}")
     
+    def export_to_s3_import(self, bucket: str, prefix: str = 'hn-migration'):
+        """Load articles and comments through DynamoDB Import Table from S3.
+        
+        Import Table creates the target tables itself and does not consume
+        write capacity, so this is meant for initial loads into an account
+        where the articles and comments tables do not exist yet.
+        """
+        print(f"\n📦 Exporting to s3://{bucket}/{prefix} for DynamoDB import...")
+        
+        s3 = boto3.client(
+            's3',
+            aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
+            aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
+            region_name=os.environ.get('AWS_REGION', 'us-west-2'),
+            config=BOTO_CONFIG
+        )
+        dynamo_client = self.dynamo_db.dynamodb.meta.client
+        serializer = TypeSerializer()
+        
+        exports = [
+            ('articles', ARTICLES_QUERY, self.dynamo_db.articles_table_name, ARTICLES_TABLE_SCHEMA,
+             self._article_record, DynamoDBManager._article_item, 'articles_migrated'),
+            ('comments', COMMENTS_QUERY, self.dynamo_db.comments_table_name, COMMENTS_TABLE_SCHEMA,
+             self._comment_record, DynamoDBManager._comment_item, 'comments_migrated'),
+        ]
+        
+        import_arns = []
+        for source, query, table_name, schema, to_record, to_item, stat in exports:
+            cursor = self.sqlite_conn.cursor()
+            cursor.execute(query)
+            
+            spool = tempfile.NamedTemporaryFile(suffix='.json.gz', delete=False)
+            spool.close()
+            try:
+                # One DynamoDB-JSON item per line, gzip-compressed
+                written = 0
+                with gzip.open(spool.name, 'wt', encoding='utf-8') as out:
+                    while True:
+                        rows = cursor.fetchmany(EXPORT_FETCH_SIZE)
+                        if not rows:
+                            break
+                        for row in rows:
+                            try:
+                                item = to_item(to_record(row))
+                                out.write(json.dumps({'Item': serializer.serialize(item)['M']}))
+                                out.write('\n')
+                                written += 1
+                            except Exception as e:
+                                self.migration_stats['errors'].append(f"Error exporting {source} row: {str(e)}")
+                
+                if not written:
+                    print(f"   ⏭️  No {source} to export")
+                    continue
+                
+                key = f"{prefix}/{source}/{source}.json.gz"
+                s3.upload_file(spool.name, bucket, key, ExtraArgs={'ContentType': 'application/gzip'})
+                print(f"   ✅ Uploaded {written} {source} to s3://{bucket}/{key}")
+            finally:
+                os.remove(spool.name)
+            
+            try:
+                response = dynamo_client.import_table(
+                    S3BucketSource={'S3Bucket': bucket, 'S3KeyPrefix': f"{prefix}/{source}/"},
+                    InputFormat='DYNAMODB_JSON',
+                    InputCompressionType='GZIP',
+                    TableCreationParameters={'TableName': table_name, **schema}
+                )
+                import_arn = response['ImportTableDescription']['ImportArn']
+                import_arns.append(import_arn)
+                self.migration_stats[stat] += written
+                print(f"   🚚 Import into {table_name} started: {import_arn}")
+            except Exception as e:
+                error_msg = f"Could not start import into {table_name}: {str(e)}"
+                self.migration_stats['errors'].append(error_msg)
+                print(f"   ❌ {error_msg}")
+        
+        return import_arns
+    
     def verify_migration(self):
         """Verify the migration was successful."""
         print("\n🔍 Verifying migration...")
@@ -254,19 +425,75 @@ class SQLiteToDynamoDBMigrator:
                 self.sqlite_conn.close()
                 print("✅ SQLite connection closed")
 
+    def run_import(self, bucket: str):
+        """Run the migration through S3 Import Table instead of batch writes."""
+        print("🚀 Starting SQLite to DynamoDB import via S3")
+        print("=" * 60)
+        
+        try:
+            self.connect_sqlite()
+            
+            import_arns = self.export_to_s3_import(bucket)
+            # The analyses table is created by DynamoDBManager, so it can't be imported
+            self.migrate_article_analyses()
+            
+            if import_arns:
+                print("\n💡 Imports run asynchronously; check progress with describe_import:")
+                for import_arn in import_arns:
+                    print(f"   {import_arn}")
+            
+            return not self.migration_stats['errors']
+            
+        except Exception as e:
+            print(f"❌ Import failed: {str(e)}")
+            return False
+        
+        finally:
+            if hasattr(self, 'sqlite_conn'):
+                self.sqlite_conn.close()
+                print("✅ SQLite connection closed")
+
 def backup_sqlite_db(db_path: str):
-    """Create a backup of the SQLite database before deletion."""
+    """Create a backup of the SQLite database before deletion.
+    
+    Uses SQLite's online backup API, so the snapshot is consistent even
+    while the migration is reading the same database.
+    """
     backup_path = f"{db_path}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     
     try:
-        import shutil
-        shutil.copy2(db_path, backup_path)
+        src = sqlite3.connect(db_path)
+        dst = sqlite3.connect(backup_path)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+            src.close()
         print(f"✅ Created backup: {backup_path}")
         return backup_path
     except Exception as e:
         print(f"❌ Failed to create backup: {e}")
         return None
 
+def upload_backup_to_s3(backup_path: str, bucket: str, prefix: str = 'hn-migration/backups'):
+    """Upload a SQLite backup to S3, using multipart for large files."""
+    key = f"{prefix}/{os.path.basename(backup_path)}"
+    
+    try:
+        s3 = boto3.client(
+            's3',
+            aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
+            aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
+            region_name=os.environ.get('AWS_REGION', 'us-west-2'),
+            config=BOTO_CONFIG
+        )
+        s3.upload_file(backup_path, bucket, key, Config=BACKUP_TRANSFER_CONFIG)
+        print(f"✅ Uploaded backup to s3://{bucket}/{key}")
+        return True
+    except Exception as e:
+        print(f"❌ Failed to upload backup: {e}")
+        return False
+
 def delete_sqlite_db(db_path: str, backup_path: str = None):
     """Delete the SQLite database after successful migration."""
     try:
@@ -288,6 +515,13 @@ def delete_sqlite_db(db_path: str, backup_path: str = None):
         return False
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Migrate the SQLite database to DynamoDB')
+    parser.add_argument('--mode', choices=['batch', 'import-table'], default='batch',
+                        help='batch: BatchWriteItem into existing tables; import-table: S3 Import Table into new tables')
+    parser.add_argument('--bucket', default=os.environ.get('MIGRATION_S3_BUCKET'),
+                        help='S3 bucket for --mode=import-table and backup uploads (default: $MIGRATION_S3_BUCKET)')
+    args = parser.parse_args()
+    
     print("🔄 SQLite to DynamoDB Migration Tool")
     print("=" * 50)
     
@@ -297,11 +531,28 @@ if __name__ == "__main__":
         print(f"❌ SQLite database not found: {db_path}")
         sys.exit(1)
     
+    if args.mode == 'import-table' and not args.bucket:
+        print("❌ --mode=import-table needs --bucket or MIGRATION_S3_BUCKET")
+        sys.exit(1)
+    
     # Create migrator
     migrator = SQLiteToDynamoDBMigrator(db_path)
     
-    # Run migration
-    success = migrator.run_migration()
+    if args.mode == 'import-table':
+        # Imports finish asynchronously, so keep the SQLite file until they're verified
+        if migrator.run_import(args.bucket):
+            print("\n🎉 Export complete, DynamoDB imports started")
+        else:
+            print("\n❌ Import had errors. Your original SQLite database is unchanged.")
+        sys.exit(0)
+    
+    # Snapshot the database while the migration runs
+    with ThreadPoolExecutor(max_workers=1) as backup_pool:
+        backup_future = backup_pool.submit(backup_sqlite_db, db_path)
+        
+        # Run migration
+        success = migrator.run_migration()
+        backup_path = backup_future.result()
     
     if success:
         print("\n🎉 Migration completed successfully!")
@@ -311,8 +562,8 @@ if __name__ == "__main__":
         print("🗑️  DATABASE CLEANUP")
         print("=" * 60)
         
-        # Create backup first
-        backup_path = backup_sqlite_db(db_path)
+        if backup_path and args.bucket:
+            upload_backup_to_s3(backup_path, args.bucket)
         
         # Ask about deletion
         if backup_path:
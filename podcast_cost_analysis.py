@@ -3,12 +3,33 @@
 Comprehensive Cost Optimization and Podcast Strategy Analysis
 """
 
+import contextlib
+import functools
+import io
+import sys
+
 from dynamodb_manager import DynamoDBManager
 from dotenv import load_dotenv
-import json
 
 load_dotenv()
 
+# Rough bytes per comment item beyond its text (IDs, author, numbers, names)
+COMMENT_ITEM_OVERHEAD = 64
+
+def _buffered_output(func):
+    """Collect a report's prints and write them to stdout in one call."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        buffer = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(buffer):
+                return func(*args, **kwargs)
+        finally:
+            sys.stdout.write(buffer.getvalue())
+            sys.stdout.flush()
+    return wrapper
+
+@_buffered_output
 def analyze_podcast_cost_optimization():
     """Comprehensive analysis of cost optimization for podcast generation."""
     
@@ -25,11 +46,14 @@ def analyze_podcast_cost_optimization():
     print(f"   Comments per article: {stats['total_comments'] / max(stats['total_articles'], 1):.1f}")
     
     # Estimated storage costs
-    sample_article = db.get_articles(limit=1)[0] if db.get_articles(limit=1) else None
+    sample_articles = db.get_articles(limit=1)
+    sample_article = sample_articles[0] if sample_articles else None
     if sample_article:
         comments = db.get_article_comments(sample_article['hn_id'])
         if comments:
-            comment_size = len(json.dumps(comments[0]).encode('utf-8'))
+            # Average text length over a sample instead of serializing one comment
+            sizes = [len(c.get('content', '')) + COMMENT_ITEM_OVERHEAD for c in comments[:100]]
+            comment_size = sum(sizes) // len(sizes)
             total_comment_storage = comment_size * stats['total_comments']
             
             print(f"\n💾 STORAGE ANALYSIS:")
@@ -122,6 +146,7 @@ def analyze_podcast_cost_optimization():
         'cost_per_episode': 0.032
     }
 
+@_buffered_output
 def generate_implementation_roadmap():
     """Generate a roadmap for implementing the podcast system."""
     
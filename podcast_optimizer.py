@@ -4,29 +4,148 @@ Podcast-Optimized Comment Storage and Processing
 Designed for AI podcast generation with cost optimization
 """
 
-from dynamodb_manager import DynamoDBManager
+from dynamodb_manager import get_dynamo
 from dotenv import load_dotenv
+import hashlib
+import heapq
+import io
 import json
 import openai
 import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
 from typing import List, Dict, Optional
-import requests
-from collections import defaultdict
+from collections import Counter, defaultdict
 
 load_dotenv()
 
+# Chat model and persona shared by the direct and Batch API paths
+PODCAST_MODEL = "gpt-3.5-turbo"  # Use stable model
+PODCAST_SYSTEM_PROMPT = "You are an engaging podcast narrator specializing in tech discussions."
+
+# Podcast generation prompt, filled in per article
+PODCAST_PROMPT_TEMPLATE = """You are a podcast narrator summarizing a Hacker News discussion thread titled: "{article_title}".
+Your task is to produce a monologue that sounds natural, engaging, and reflective—like a host recapping an online conversation for an audience.
+
+ARTICLE CONTEXT:
+- Title: {article_title}
+- URL: {article_url}
+- Upvotes: {article_score}
+- Platform: Hacker News (tech-focused community)
+
+DISCUSSION HIGHLIGHTS:
+{discussions_text}
+
+Include the following structure:
+Hook/Intro – Introduce the post and its topic in 1–2 sentences.
+Highlights – Retell key arguments, reactions, or insights using the phrasing of commenters when impactful, witty, or insightful.
+Tone Shifts – Capture tone variety: technical debate, humor, personal anecdotes, skepticism, etc.
+Contrasting Takes – Acknowledge when opinions diverge and represent both sides neutrally.
+Reflective Close – Wrap up with a general observation or leave the listener with a thought to ponder.
+
+Keep it under 500 words. Do not sanitize informal language unless necessary. Avoid over-polishing. Preserve the energy and technical insights of the thread.
+Focus on the most engaging and insightful comments that would interest a tech-savvy audience."""
+
+# Comment attributes the podcast pipeline reads; the rest stay in DynamoDB
+PODCAST_COMMENT_FIELDS = ['comment_id', 'parent_id', 'author', 'content', 'level']
+
+# Seconds between Batch API status checks, and how long to wait on a batch
+# before cancelling it and requesting the scripts directly
+BATCH_POLL_SECONDS = 30
+BATCH_MAX_WAIT_SECONDS = 2 * 3600
+
+# Generated scripts are reused for identical discussions for this long
+SCRIPT_CACHE_PATH = os.getenv('PODCAST_SCRIPT_CACHE', 'podcast_script_cache.db')
+SCRIPT_CACHE_DAYS = 30
+
+# Direct (non-batch) generation: concurrent requests, retries on transient
+# errors, and the account limits the throttle keeps under
+SCRIPT_WORKERS = 8
+SCRIPT_RETRY_ATTEMPTS = 2
+REQUESTS_PER_MINUTE = 500
+TOKENS_PER_MINUTE = 60000
+
+# Comments are cut to their top sentences before going into the prompt
+SUMMARY_SENTENCES = 2
+SUMMARY_MAX_CHARS = 500
+
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+_WORD_RE = re.compile(r"[a-z0-9']{3,}")
+
+# Comment quality checks scan with these and stop as soon as they have an answer
+_HTTP_RE = re.compile(r'http')
+_TOKEN_RE = re.compile(r'\S+')
+
+def _has_at_least(pattern: re.Pattern, text: str, n: int) -> bool:
+    """Check for n matches of pattern without scanning past the nth."""
+    return next(islice(pattern.finditer(text), n - 1, None), None) is not None
+
+def _extractive_summary(text: str, n: int = SUMMARY_SENTENCES) -> str:
+    """Keep the n sentences whose words recur most in the text, in order."""
+    sentences = [sentence for sentence in _SENTENCE_RE.split(text.strip()) if sentence]
+    if len(sentences) <= n:
+        return text[:SUMMARY_MAX_CHARS]
+    
+    freq = Counter(_WORD_RE.findall(text.lower()))
+    def score(sentence):
+        words = _WORD_RE.findall(sentence.lower())
+        return sum(freq[word] for word in words) / (len(words) or 1)
+    
+    top = heapq.nlargest(n, range(len(sentences)), key=lambda i: score(sentences[i]))
+    return ' '.join(sentences[i] for i in sorted(top))[:SUMMARY_MAX_CHARS]
+
+class _RateLimiter:
+    """Token-bucket throttle on requests and tokens per minute, shared by threads."""
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.capacity = {'requests': requests_per_minute, 'tokens': tokens_per_minute}
+        self.available = dict(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self, tokens: int):
+        """Block until one request with this many tokens fits in the budget."""
+        tokens = min(tokens, self.capacity['tokens'])
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                elapsed = now - self.updated
+                self.updated = now
+                for key, capacity in self.capacity.items():
+                    self.available[key] = min(capacity, self.available[key] + capacity * elapsed / 60)
+                
+                if self.available['requests'] >= 1 and self.available['tokens'] >= tokens:
+                    self.available['requests'] -= 1
+                    self.available['tokens'] -= tokens
+                    return
+            time.sleep(0.1)
+
+@lru_cache(maxsize=1)
+def get_openai_client(api_key: str) -> openai.OpenAI:
+    """Return the process-wide OpenAI client, so its connection pool is reused.
+    
+    SDK retries are off; generate_podcast_script retries through the rate limiter.
+    """
+    return openai.OpenAI(api_key=api_key, max_retries=0)
+
 class PodcastOptimizedCommentProcessor:
     """Optimized comment processor for podcast generation."""
     
     def __init__(self):
-        self.db = DynamoDBManager()
+        self.db = get_dynamo()
         
         # OpenAI client with proper initialization
         openai_api_key = os.getenv('OPENAI_API_KEY')
         if openai_api_key:
             try:
-                self.openai_client = openai.OpenAI(api_key=openai_api_key)
+                self.openai_client = get_openai_client(openai_api_key)
                 self.has_openai = True
                 print("✅ OpenAI client initialized")
             except Exception as e:
@@ -36,6 +155,13 @@ class PodcastOptimizedCommentProcessor:
             print("⚠️  No OpenAI API key found, using mock responses")
             self.has_openai = False
         
+        self.rate_limiter = _RateLimiter(REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE)
+        
+        # Comments per article, shared by the storage analysis and thread extraction
+        self._comments_cache = {}
+        
+        self.script_cache = self._open_script_cache()
+        
         # Podcast-specific optimization settings
         self.min_comment_score = 3  # Only store comments with 3+ upvotes
         self.max_comments_per_article = 20  # Reduced from 100 for podcast quality
@@ -47,6 +173,60 @@ class PodcastOptimizedCommentProcessor:
         print(f"   Max comments per article: {self.max_comments_per_article}")
         print(f"   Min discussion thread: {self.min_discussion_thread_length}")
     
+    def _open_script_cache(self) -> Optional[sqlite3.Connection]:
+        """Open the generated-script cache, dropping expired entries."""
+        try:
+            conn = sqlite3.connect(SCRIPT_CACHE_PATH)
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS script_cache (
+                    key TEXT PRIMARY KEY,
+                    script TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('DELETE FROM script_cache WHERE created_at < ?',
+                         (time.time() - SCRIPT_CACHE_DAYS * 86400,))
+            conn.commit()
+            return conn
+        except sqlite3.Error as e:
+            print(f"⚠️  Script cache unavailable: {e}")
+            return None
+    
+    def _script_cache_key(self, article: Dict, discussion_threads: List[Dict]) -> str:
+        """Key a script by its article and the exact discussion text it was built from."""
+        discussions_digest = hashlib.blake2b(
+            self._format_discussions(discussion_threads).encode('utf-8')
+        ).hexdigest()
+        return hashlib.sha256(f"{article['hn_id']}|{discussions_digest}".encode('utf-8')).hexdigest()
+    
+    def _get_cached_scripts(self, keys: List[str]) -> Dict[str, str]:
+        """Look up cached scripts by key."""
+        if not self.script_cache or not keys:
+            return {}
+        try:
+            placeholders = ','.join('?' * len(keys))
+            rows = self.script_cache.execute(
+                f'SELECT key, script FROM script_cache WHERE key IN ({placeholders})', keys
+            ).fetchall()
+            return dict(rows)
+        except sqlite3.Error as e:
+            print(f"⚠️  Script cache lookup failed: {e}")
+            return {}
+    
+    def _store_cached_scripts(self, scripts: Dict[str, str]):
+        """Save newly generated scripts by key."""
+        if not self.script_cache or not scripts:
+            return
+        try:
+            now = time.time()
+            self.script_cache.executemany(
+                'INSERT OR REPLACE INTO script_cache (key, script, created_at) VALUES (?, ?, ?)',
+                [(key, script, now) for key, script in scripts.items()]
+            )
+            self.script_cache.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not cache scripts: {e}")
+    
     def should_store_comment_for_podcast(self, comment_data: Dict, level: int) -> bool:
         """Determine if comment is worth storing for podcast generation."""
         # Must have good score (engagement indicator)
@@ -63,28 +243,46 @@ class PodcastOptimizedCommentProcessor:
             return False
         
         # Skip pure links or very short responses
-        if content.count('http') > 2 or len(content.split()) < 10:
+        if _has_at_least(_HTTP_RE, content, 3) or not _has_at_least(_TOKEN_RE, content, 10):
             return False
         
         return True
     
+    def get_comments(self, article_id: str) -> List[Dict]:
+        """Get an article's comments, querying DynamoDB once per article."""
+        comments = self._comments_cache.get(article_id)
+        if comments is None:
+            comments = self.db.get_article_comments(article_id, projection=PODCAST_COMMENT_FIELDS)
+            self._comments_cache[article_id] = comments
+        return comments
+    
+    def prefetch_comments(self, article_ids: List[str]):
+        """Load comments for several articles in one concurrent fetch."""
+        missing = [str(article_id) for article_id in article_ids if str(article_id) not in self._comments_cache]
+        if missing:
+            self._comments_cache.update(
+                self.db.batch_get_article_comments(missing, projection=PODCAST_COMMENT_FIELDS)
+            )
+    
     def extract_discussion_threads(self, article_id: str) -> List[Dict]:
         """Extract discussion threads optimized for podcast narrative."""
-        comments = self.db.get_article_comments(article_id)
+        comments = self.get_comments(article_id)
         
-        # Group by thread (parent-child relationships)
+        # Group by thread (parent-child relationships), indexing replies by
+        # parent in one pass instead of rescanning every comment per thread
         threads = defaultdict(list)
-        comment_lookup = {c['comment_id']: c for c in comments}
+        children = defaultdict(list)
+        for comment in comments:
+            children[comment['parent_id']].append(comment)
         
         for comment in comments:
             if comment['level'] == 0:  # Top-level comment
                 thread_id = comment['comment_id']
                 threads[thread_id].append(comment)
                 
-                # Find replies
-                replies = [c for c in comments if c['parent_id'] == comment['comment_id']]
-                replies.sort(key=lambda x: x.get('score', 0), reverse=True)
-                threads[thread_id].extend(replies[:5])  # Top 5 replies
+                # Top 5 replies
+                replies = children.get(comment['comment_id'], [])
+                threads[thread_id].extend(heapq.nlargest(5, replies, key=lambda x: x.get('score', 0)))
         
         # Filter for substantial discussions
         substantial_threads = []
@@ -104,49 +302,40 @@ class PodcastOptimizedCommentProcessor:
         substantial_threads.sort(key=lambda x: x['engagement_score'], reverse=True)
         return substantial_threads[:5]  # Top 5 discussions for podcast
     
-    def generate_podcast_script(self, article: Dict, discussion_threads: List[Dict]) -> str:
-        """Generate podcast script using OpenAI."""
-        
-        # Prepare context for AI
-        article_title = article['title']
-        article_url = article.get('url', 'news.ycombinator.com')
-        article_score = article.get('score', 0)
-        
-        # Format discussion threads for AI
-        discussions_text = ""
+    def _format_discussions(self, discussion_threads: List[Dict]) -> str:
+        """Format discussion threads as prompt context."""
+        parts = []
         for i, thread in enumerate(discussion_threads, 1):
-            discussions_text += f"\n--- Discussion Thread {i} (Score: {thread['engagement_score']}) ---\n"
+            parts.append(f"\n--- Discussion Thread {i} (Score: {thread['engagement_score']}) ---\n")
             for comment in thread['comments']:
                 author = comment.get('author', 'unknown')
-                content = comment.get('content', '')[:500]  # Limit for context
                 score = comment.get('score', 0)
+                content = _extractive_summary(comment.get('content', ''))
                 level = comment.get('level', 0)
                 indent = "  " * level
-                discussions_text += f"{indent}• {author} (+{score}): {content}\n"
-        
-        # Podcast generation prompt
-        prompt = f"""You are a podcast narrator summarizing a Hacker News discussion thread titled: "{article_title}".
-Your task is to produce a monologue that sounds natural, engaging, and reflective—like a host recapping an online conversation for an audience.
-
-ARTICLE CONTEXT:
-- Title: {article_title}
-- URL: {article_url}
-- Upvotes: {article_score}
-- Platform: Hacker News (tech-focused community)
-
-DISCUSSION HIGHLIGHTS:
-{discussions_text}
-
-Include the following structure:
-Hook/Intro – Introduce the post and its topic in 1–2 sentences.
-Highlights – Retell key arguments, reactions, or insights using the phrasing of commenters when impactful, witty, or insightful.
-Tone Shifts – Capture tone variety: technical debate, humor, personal anecdotes, skepticism, etc.
-Contrasting Takes – Acknowledge when opinions diverge and represent both sides neutrally.
-Reflective Close – Wrap up with a general observation or leave the listener with a thought to ponder.
-
-Keep it under 500 words. Do not sanitize informal language unless necessary. Avoid over-polishing. Preserve the energy and technical insights of the thread.
-Focus on the most engaging and insightful comments that would interest a tech-savvy audience."""
+                parts.append(f"{indent}• {author} (+{score}): {content}\n")
+        return "".join(parts)
+    
+    def _script_messages(self, article: Dict, discussions_text: str) -> List[Dict]:
+        """Build the chat messages for an article's podcast script."""
+        prompt = PODCAST_PROMPT_TEMPLATE.format(
+            article_title=article['title'],
+            article_url=article.get('url', 'news.ycombinator.com'),
+            article_score=article.get('score', 0),
+            discussions_text=discussions_text
+        )
 
+        return [
+            {"role": "system", "content": PODCAST_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def generate_podcast_script(self, article: Dict, discussion_threads: List[Dict]) -> str:
+        """Generate podcast script using OpenAI."""
+        article_title = article['title']
+        article_score = article.get('score', 0)
+        discussions_text = self._format_discussions(discussion_threads)
+        
         try:
             if not self.has_openai:
                 # Return a structured mock script for testing
@@ -167,65 +356,159 @@ What's your take on this? The full discussion continues on Hacker News."""
                 return script
             
             # Real OpenAI integration
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",  # Use stable model
-                messages=[
-                    {"role": "system", "content": "You are an engaging podcast narrator specializing in tech discussions."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=600,
-                temperature=0.7
-            )
+            messages = self._script_messages(article, discussions_text)
+            # Rough prompt size (~4 characters per token) plus the completion budget
+            tokens = sum(len(m['content']) for m in messages) // 4 + 600
             
-            return response.choices[0].message.content
+            for attempt in range(SCRIPT_RETRY_ATTEMPTS + 1):
+                # Every attempt, retries included, counts against the throttle
+                self.rate_limiter.acquire(tokens)
+                try:
+                    response = self.openai_client.chat.completions.create(
+                        model=PODCAST_MODEL,
+                        messages=messages,
+                        max_tokens=600,
+                        temperature=0.7
+                    )
+                    return response.choices[0].message.content
+                except (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError) as e:
+                    if attempt == SCRIPT_RETRY_ATTEMPTS:
+                        raise
+                    print(f"   ⚠️  OpenAI request failed ({e}), retrying...")
+                    time.sleep(2 ** attempt)
             
         except Exception as e:
             print(f"❌ Error generating podcast script: {e}")
             return None
     
-    def save_podcast_episode(self, article_id: str, script: str, metadata: Dict) -> bool:
-        """Save podcast episode to database."""
-        try:
-            episode_data = {
-                'hn_id': article_id,
-                'script': script,
-                'title': metadata.get('title', ''),
-                'generated_at': datetime.now().isoformat(),
-                'episode_length': len(script.split()),
-                'discussion_count': metadata.get('discussion_count', 0),
-                'total_engagement': metadata.get('total_engagement', 0)
+    def generate_scripts_parallel(self, candidates: List[tuple]) -> Dict[str, str]:
+        """Generate scripts for (article, threads) pairs with concurrent requests."""
+        scripts = {}
+        with ThreadPoolExecutor(max_workers=SCRIPT_WORKERS) as executor:
+            futures = {
+                executor.submit(self.generate_podcast_script, article, threads): str(article['hn_id'])
+                for article, threads in candidates
             }
+            for future in as_completed(futures):
+                scripts[futures[future]] = future.result()
+        return scripts
+    
+    def submit_batch(self, candidates: List[tuple]) -> Dict[str, str]:
+        """Generate scripts for (article, threads) pairs in one Batch API job.
+        
+        Batch requests are billed at half price; the call blocks until the
+        job finishes and returns a mapping of hn_id to script.
+        """
+        lines = []
+        for article, threads in candidates:
+            lines.append(json.dumps({
+                "custom_id": str(article['hn_id']),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": PODCAST_MODEL,
+                    "messages": self._script_messages(article, self._format_discussions(threads)),
+                    "max_tokens": 600,
+                    "temperature": 0.7
+                }
+            }))
+        
+        try:
+            batch_file = self.openai_client.files.create(
+                file=("podcast_scripts.jsonl", io.BytesIO("\n".join(lines).encode('utf-8'))),
+                purpose="batch"
+            )
+            batch = self.openai_client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            print(f"   📤 Submitted batch {batch.id} with {len(lines)} scripts")
+            
+            deadline = time.monotonic() + BATCH_MAX_WAIT_SECONDS
+            while batch.status not in ('completed', 'failed', 'expired', 'cancelled'):
+                if time.monotonic() >= deadline:
+                    print(f"⏰ Batch {batch.id} still {batch.status} after {BATCH_MAX_WAIT_SECONDS}s, cancelling")
+                    self.openai_client.batches.cancel(batch.id)
+                    return {}
+                time.sleep(BATCH_POLL_SECONDS)
+                batch = self.openai_client.batches.retrieve(batch.id)
             
-            # We can reuse the analyses table for podcast episodes
-            return self.db.insert_analysis({
-                'hn_id': f"podcast_{article_id}",
-                'title': f"Podcast: {metadata.get('title', '')}",
-                'url': metadata.get('url', ''),
-                'domain': 'podcast.generated',
-                'summary': script,
-                'generated_at': datetime.now().isoformat()
-            })
+            if batch.status != 'completed' or not batch.output_file_id:
+                print(f"❌ Batch {batch.id} ended with status {batch.status}")
+                return {}
+            
+            scripts = {}
+            output = self.openai_client.files.content(batch.output_file_id).text
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                response = result.get('response') or {}
+                if response.get('status_code') == 200:
+                    scripts[result['custom_id']] = response['body']['choices'][0]['message']['content']
+                else:
+                    print(f"❌ Batch request {result.get('custom_id')} failed: {result.get('error')}")
+            return scripts
             
+        except Exception as e:
+            print(f"❌ Error running podcast script batch: {e}")
+            return {}
+    
+    @staticmethod
+    def _episode_record(article_id: str, script: str, metadata: Dict) -> Dict:
+        """Build the analyses-table record for a podcast episode."""
+        # We can reuse the analyses table for podcast episodes
+        return {
+            'hn_id': f"podcast_{article_id}",
+            'title': f"Podcast: {metadata.get('title', '')}",
+            'url': metadata.get('url', ''),
+            'domain': 'podcast.generated',
+            'summary': script,
+            'generated_at': datetime.now().isoformat()
+        }
+    
+    def save_podcast_episode(self, article_id: str, script: str, metadata: Dict) -> bool:
+        """Save podcast episode to database."""
+        try:
+            return self.db.insert_analysis(self._episode_record(article_id, script, metadata))
         except Exception as e:
             print(f"❌ Error saving podcast episode: {e}")
             return False
     
-    def generate_daily_podcast_episodes(self, days_back: int = 1) -> List[Dict]:
-        """Generate podcast episodes for top articles from recent days."""
+    def save_podcast_episodes(self, records: List[Dict]) -> bool:
+        """Save several episode records in batched writes instead of one put each."""
+        try:
+            return self.db.batch_write_analyses(records)
+        except Exception as e:
+            print(f"❌ Error saving podcast episodes: {e}")
+            return False
+    
+    def generate_daily_podcast_episodes(self, days_back: int = 1, use_batch: bool = True) -> List[Dict]:
+        """Generate podcast episodes for top articles from recent days.
+        
+        With use_batch the scripts go through the Batch API (half price,
+        up to 24h) when the openai package supports it; otherwise, or for
+        anything the batch doesn't return, they are requested directly in
+        parallel.
+        """
         print(f"🎙️ Generating podcast episodes for last {days_back} day(s)...")
         
         # Get recent high-engagement articles
         articles = self.db.get_articles(limit=20, sort_by='score')
         
-        # Filter for articles with good engagement (score > 50)
-        podcast_worthy_articles = [
+        # Filter for articles with good engagement (score > 50), stopping at the top 5
+        podcast_worthy_articles = list(islice((
             a for a in articles 
-            if int(a.get('score', 0)) > 50 and int(a.get('num_comments', 0)) > 10
-        ]
+            if a['score'] > 50 and a['num_comments'] > 10
+        ), 5))
         
-        episodes = []
+        candidates = []
         
-        for i, article in enumerate(podcast_worthy_articles[:5]):  # Top 5 articles
+        # Fetch every candidate's comments up front instead of one Query per loop pass
+        self.prefetch_comments([article['hn_id'] for article in podcast_worthy_articles])
+        
+        for i, article in enumerate(podcast_worthy_articles):
             print(f"\n📰 Processing article {i+1}/5: {article['title'][:50]}...")
             
             # Extract discussion threads
@@ -236,45 +519,90 @@ What's your take on this? The full discussion continues on Hacker News."""
                 continue
             
             print(f"   💬 Found {len(threads)} discussion threads")
-            
-            # Generate podcast script
-            script = self.generate_podcast_script(article, threads)
+            candidates.append((article, threads))
+        
+        # Reuse scripts already generated for the same discussions
+        scripts = {}
+        pending = candidates
+        if self.has_openai:
+            keys = {str(article['hn_id']): self._script_cache_key(article, threads)
+                    for article, threads in candidates}
+            cached = self._get_cached_scripts(list(keys.values()))
+            scripts = {hn_id: cached[key] for hn_id, key in keys.items() if key in cached}
+            pending = [(article, threads) for article, threads in candidates
+                       if str(article['hn_id']) not in scripts]
+            if scripts:
+                print(f"\n♻️  Reusing {len(scripts)} cached script(s)")
+        
+        # Generate podcast scripts, all in one batch job when OpenAI is available
+        # and the installed SDK has the Batch API
+        generated = {}
+        if self.has_openai and pending and use_batch:
+            if hasattr(self.openai_client, 'batches'):
+                generated = self.submit_batch(pending)
+            else:
+                print("⚠️  Installed openai package has no Batch API, requesting scripts directly")
+        
+        # Anything the batch didn't return is requested directly
+        remaining = [(article, threads) for article, threads in pending
+                     if str(article['hn_id']) not in generated]
+        if remaining:
+            generated.update(self.generate_scripts_parallel(remaining))
+        scripts.update(generated)
+        
+        if self.has_openai:
+            self._store_cached_scripts({keys[hn_id]: script for hn_id, script in generated.items() if script})
+        
+        episodes = []
+        records = []
+        
+        for article, threads in candidates:
+            script = scripts.get(str(article['hn_id']))
             
             if script:
-                # Save episode
                 metadata = {
                     'title': article['title'],
                     'url': article.get('url', ''),
                     'discussion_count': len(threads),
                     'total_engagement': sum(t['engagement_score'] for t in threads)
                 }
-                
-                if self.save_podcast_episode(article['hn_id'], script, metadata):
-                    episode = {
-                        'article_id': article['hn_id'],
-                        'title': article['title'],
-                        'script': script,
-                        'word_count': len(script.split()),
-                        'discussion_threads': len(threads),
-                        'engagement_score': metadata['total_engagement']
-                    }
-                    episodes.append(episode)
-                    print(f"   ✅ Generated podcast episode ({len(script.split())} words)")
-                else:
-                    print("   ❌ Failed to save podcast episode")
+                records.append(self._episode_record(article['hn_id'], script, metadata))
+                episodes.append({
+                    'article_id': article['hn_id'],
+                    'title': article['title'],
+                    'script': script,
+                    'word_count': len(script.split()),
+                    'discussion_threads': len(threads),
+                    'engagement_score': metadata['total_engagement']
+                })
             else:
-                print("   ❌ Failed to generate script")
+                print(f"   ❌ Failed to generate script for {article['title'][:50]}")
+        
+        # Save every episode in one batched write
+        if records and not self.save_podcast_episodes(records):
+            print("   ❌ Failed to save podcast episodes")
+            episodes = []
+        for episode in episodes:
+            print(f"   ✅ Generated podcast episode ({episode['word_count']} words)")
+        
+        # Don't carry comments over into a later run
+        self._comments_cache.clear()
         
         print(f"\n🎉 Generated {len(episodes)} podcast episodes!")
         return episodes
 
-def optimize_comment_storage_for_podcasts():
+def episode_columns(episodes: List[Dict]) -> Dict[str, List]:
+    """Turn episode dicts into a dict of field name to list, for run-level totals."""
+    fields = ['article_id', 'title', 'word_count', 'discussion_threads', 'engagement_score']
+    return {field: [episode[field] for episode in episodes] for field in fields}
+
+def optimize_comment_storage_for_podcasts(processor: PodcastOptimizedCommentProcessor = None):
     """Analyze and optimize comment storage for podcast generation."""
     print("📊 OPTIMIZING COMMENT STORAGE FOR PODCASTS")
     print("=" * 60)
     
-    db = DynamoDBManager()
-    processor = PodcastOptimizedCommentProcessor()
+    db = get_dynamo()
+    processor = processor or PodcastOptimizedCommentProcessor()
     
     # Analyze current comment quality
     stats = db.get_stats()
@@ -287,7 +615,7 @@ def optimize_comment_storage_for_podcasts():
     podcast_worthy_comments = 0
     
     for article in articles:
-        comments = db.get_article_comments(article['hn_id'])
+        comments = processor.get_comments(article['hn_id'])
         total_comments_analyzed += len(comments)
         
         # Simulate quality check (we can't check score from stored comments)
@@ -316,17 +644,25 @@ def optimize_comment_storage_for_podcasts():
     print(f"   • Improved podcast quality through curation")
 
 if __name__ == "__main__":
+    # One processor for both steps so comments fetched for the analysis are reused
+    processor = PodcastOptimizedCommentProcessor()
+    
     # Run optimization analysis
-    optimize_comment_storage_for_podcasts()
+    optimize_comment_storage_for_podcasts(processor)
     
     # Test podcast generation
     print(f"\n🧪 TESTING PODCAST GENERATION")
     print("=" * 40)
     
-    processor = PodcastOptimizedCommentProcessor()
-    episodes = processor.generate_daily_podcast_episodes(days_back=1)
+    # --realtime skips the Batch API queue for immediate results
+    episodes = processor.generate_daily_podcast_episodes(days_back=1, use_batch='--realtime' not in sys.argv)
     
     if episodes:
+        columns = episode_columns(episodes)
+        print(f"\n📊 RUN TOTALS:")
+        print(f"Words: {sum(columns['word_count'])}")
+        print(f"Engagement: {sum(columns['engagement_score'])}")
+        
         print(f"\n📋 SAMPLE EPISODE:")
         sample = episodes[0]
         print(f"Title: {sample['title']}")
@@ -4,17 +4,106 @@ Podcast-Optimized Daily Scraper
 Focuses on high-quality comments and discussions for podcast generation
 """
 
+import heapq
+import html
+import inspect
 import requests
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Optional
 from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dynamodb_manager import DynamoDBManager
 from dotenv import load_dotenv
 import re
 
+# Optional fast JSON decoder for HN API responses
+try:
+    import orjson
+    USE_ORJSON = True
+except ImportError:
+    USE_ORJSON = False
+
 load_dotenv()
 
+# Concurrent item requests against the HN API (also the connection pool size)
+FETCH_WORKERS = 32
+
+# Items kept from earlier fetches in this run (oldest dropped first)
+ITEM_CACHE_SIZE = 8192
+
+# Stories processed at once, and how many may start per second
+ARTICLE_WORKERS = 5
+ARTICLES_PER_SECOND = 5
+
+# Transient HN API failures are retried by the connection pool with exponential
+# backoff (Retry-After is honored); the last response is returned for
+# raise_for_status once retries run out. The backoff is jittered where urllib3
+# supports it (2.x; botocore keeps 1.26 on older Pythons).
+_RETRY_JITTER = (
+    {'backoff_jitter': 0.2}
+    if 'backoff_jitter' in inspect.signature(Retry.__init__).parameters else {}
+)
+HTTP_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset({'GET'}),
+    raise_on_status=False,
+    **_RETRY_JITTER
+)
+
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Title words marking job posts rather than discussions
+_JOB_KEYWORDS = ('hiring', 'job', 'jobs', 'who is hiring')
+
+# Markers of code-heavy comments, matched in a single scan
+_CODE_RE = re.compile(r'```|def |function|import |#!/')
+
+def _response_json(response: requests.Response):
+    """Decode a JSON response body, with orjson when it is installed."""
+    if USE_ORJSON:
+        return orjson.loads(response.content)
+    return response.json()
+
+class _Throttle:
+    """Space calls at least 1/rate seconds apart, shared by threads."""
+    
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second
+        self.next_time = 0.0
+        self.lock = threading.Lock()
+    
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+@lru_cache(maxsize=2048)
+def _extract_domain(url: str) -> str:
+    """Return the lowercased host of url without a leading www."""
+    try:
+        if not url:
+            return 'news.ycombinator.com'
+        if url.startswith(('http://', 'https://')):
+            # Common case: the host is the third '/'-separated field
+            domain = url.split('/', 3)[2].partition('?')[0].partition('#')[0].lower()
+        else:
+            domain = urlparse(url).netloc.lower()
+        if domain.startswith('www.'):
+            domain = domain[4:]
+        return domain
+    except:
+        return 'unknown'
+
 class PodcastOptimizedScraper:
     """HN Scraper optimized for podcast-quality content."""
     
@@ -23,12 +112,22 @@ class PodcastOptimizedScraper:
         self.base_url = "https://hacker-news.firebaseio.com/v0"
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': 'HN-Podcast-Scraper/1.0'})
+        self.session.mount('https://', HTTPAdapter(pool_maxsize=FETCH_WORKERS, max_retries=HTTP_RETRY))
+        
+        # One pool for all item fetches, so concurrent articles share FETCH_WORKERS
+        self.fetch_pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+        self.throttle = _Throttle(ARTICLES_PER_SECOND)
+        
+        # Successful item fetches, reused when an ID comes up again in the run
+        self._item_cache = {}
+        self._item_cache_lock = threading.Lock()
         
         # Podcast-optimized settings
         self.min_article_score = 50  # Only articles with 50+ upvotes
         self.min_article_comments = 10  # Must have at least 10 comments
         self.min_comment_score = 3  # Only comments with 3+ upvotes
         self.max_comments_per_article = 20  # Focus on best comments
+        self.max_comment_candidates = 60  # HN lists kids best-first; fetch only the head
         self.max_comment_length = 1000  # Longer comments for context
         
         print("🎙️ Initialized podcast-optimized scraper")
@@ -47,13 +146,17 @@ class PodcastOptimizedScraper:
         
         # Skip job posts and other non-discussion content
         title = story_data.get('title', '').lower()
-        if any(keyword in title for keyword in ['hiring', 'job', 'jobs', 'who is hiring']):
+        if any(keyword in title for keyword in _JOB_KEYWORDS):
             return False
         
         return True
     
     def is_podcast_worthy_comment(self, comment_data: Dict, level: int) -> bool:
-        """Check if comment is worth storing for podcast."""
+        """Check if comment is worth storing for podcast.
+        
+        Checks run cheapest first: field lookups, then length, then the
+        scans over the text.
+        """
         # Check score (key quality indicator)
         score = comment_data.get('score', 0)
         if score < self.min_comment_score:
@@ -64,7 +167,7 @@ class PodcastOptimizedScraper:
             return False
         
         # Content quality checks
-        content = comment_data.get('text', '')
+        content = comment_data.get('text') or ''
         if len(content) < 100:  # Substantial content required
             return False
         
@@ -72,25 +175,40 @@ class PodcastOptimizedScraper:
         if content.count('http') > 3:
             return False
         
-        # Skip comments that are mostly code
-        code_indicators = ['```', 'def ', 'function', 'import ', '#!/']
-        if sum(1 for indicator in code_indicators if indicator in content) > 2:
-            return False
+        # Skip comments that are mostly code (more than two kinds of marker)
+        markers = set()
+        for match in _CODE_RE.finditer(content):
+            markers.add(match.group())
+            if len(markers) > 2:
+                return False
         
         return True
     
-    def get_item_with_retry(self, item_id: int, max_retries: int = 3) -> Optional[Dict]:
-        """Get item with retry logic for reliability."""
-        for attempt in range(max_retries):
-            try:
-                response = self.session.get(f"{self.base_url}/item/{item_id}.json", timeout=10)
-                response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    print(f"❌ Failed to fetch item {item_id} after {max_retries} attempts: {e}")
-                    return None
-                time.sleep(0.5 * (attempt + 1))  # Exponential backoff
+    def get_item_with_retry(self, item_id: int) -> Optional[Dict]:
+        """Get item; the session adapter retries transient failures with backoff."""
+        data = self._item_cache.get(item_id)
+        if data is not None:
+            return data
+        
+        try:
+            response = self.session.get(f"{self.base_url}/item/{item_id}.json", timeout=10)
+            response.raise_for_status()
+            data = _response_json(response)
+        except Exception as e:
+            print(f"❌ Failed to fetch item {item_id}: {e}")
+            return None
+        
+        if data:
+            with self._item_cache_lock:
+                self._item_cache[item_id] = data
+                if len(self._item_cache) > ITEM_CACHE_SIZE:
+                    self._item_cache.pop(next(iter(self._item_cache)))
+        return data
+    
+    def fetch_items(self, item_ids: List[int]) -> Dict[int, Dict]:
+        """Fetch several items concurrently, keeping request order and dropping failures."""
+        results = self.fetch_pool.map(self.get_item_with_retry, item_ids)
+        return {item_id: data for item_id, data in zip(item_ids, results) if data}
     
     def scrape_podcast_optimized_comments(self, story_id: str, comment_ids: List[int]) -> Dict:
         """Scrape comments optimized for podcast quality."""
@@ -99,76 +217,105 @@ class PodcastOptimizedScraper:
         
         comments_stored = 0
         threads_found = 0
-        comment_scores = []  # Track scores for analysis
-        
-        print(f"    📊 Analyzing {len(comment_ids)} comments for podcast quality...")
-        
-        # First pass: get all comment data and scores
-        comment_data_cache = {}
-        for comment_id in comment_ids:
-            data = self.get_item_with_retry(comment_id)
-            if data:
-                comment_data_cache[comment_id] = data
-                comment_scores.append(data.get('score', 0))
-        
-        # Sort comments by score (best first)
-        sorted_comments = sorted(
-            comment_data_cache.items(), 
-            key=lambda x: x[1].get('score', 0), 
-            reverse=True
+        pending = []  # Records written together once the article is done
+        scraped_at = datetime.now().isoformat()
+        
+        # HN already ranks kids, so the best comments are near the front
+        candidate_ids = comment_ids[:max(self.max_comment_candidates, self.max_comments_per_article)]
+        
+        print(f"    📊 Analyzing {len(candidate_ids)} of {len(comment_ids)} comments for podcast quality...")
+        
+        # First pass: get candidate comment data and scores
+        comment_data_cache = self.fetch_items(candidate_ids)
+        comment_scores = [data.get('score', 0) for data in comment_data_cache.values()]
+        
+        # Best comments by score, without sorting the whole thread
+        best_comments = heapq.nlargest(
+            self.max_comments_per_article,
+            comment_data_cache.items(),
+            key=lambda x: x[1].get('score', 0)
         )
         
+        # Keep the podcast-worthy ones among the best
+        top_comments = [
+            (comment_id, comment_data)
+            for comment_id, comment_data in best_comments
+            if self.is_podcast_worthy_comment(comment_data, 0)
+        ]
+        
+        # Fetch the replies of every popular comment in one concurrent round
+        reply_cache = self.fetch_items([
+            reply_id
+            for _, comment_data in top_comments
+            if comment_data.get('score', 0) > 10  # Popular comments
+            for reply_id in comment_data.get('kids', [])[:5]  # Top 5 replies
+        ])
+        
         # Store top-quality comments
-        for comment_id, comment_data in sorted_comments[:self.max_comments_per_article]:
-            if self.is_podcast_worthy_comment(comment_data, 0):
-                # Store the comment
-                comment_record = {
-                    'comment_id': str(comment_id),
-                    'article_id': story_id,
-                    'parent_id': str(comment_data.get('parent', '')),
-                    'author': comment_data.get('by', 'unknown'),
-                    'content': self.clean_html(comment_data.get('text', ''))[:self.max_comment_length],
-                    'time_posted': comment_data.get('time', 0),
-                    'level': 0,
-                    'score': comment_data.get('score', 0),  # Store score for analysis
-                    'scraped_at': datetime.now().isoformat()
-                }
+        for comment_id, comment_data in top_comments:
+            score = comment_data.get('score', 0)
+            kids = comment_data.get('kids') or []
+            
+            # Store the comment
+            comment_record = {
+                'comment_id': str(comment_id),
+                'article_id': story_id,
+                'parent_id': str(comment_data.get('parent', '')),
+                'author': comment_data.get('by', 'unknown'),
+                'content': self.clean_html_prefix(comment_data.get('text', ''), self.max_comment_length),
+                'time_posted': comment_data.get('time', 0),
+                'level': 0,
+                'score': score,  # Store score for analysis
+                'scraped_at': scraped_at
+            }
+            
+            pending.append(comment_record)
+            
+            # Check for high-quality reply threads
+            if kids and score > 10:  # Popular comments
+                thread_replies = 0
                 
-                if self.db.insert_comment(comment_record):
-                    comments_stored += 1
+                for reply_id in kids[:5]:  # Top 5 replies
+                    reply_data = reply_cache.get(reply_id)
+                    if reply_data and self.is_podcast_worthy_comment(reply_data, 1):
+                        reply_record = {
+                            'comment_id': str(reply_id),
+                            'article_id': story_id,
+                            'parent_id': str(comment_id),
+                            'author': reply_data.get('by', 'unknown'),
+                            'content': self.clean_html_prefix(reply_data.get('text', ''), self.max_comment_length),
+                            'time_posted': reply_data.get('time', 0),
+                            'level': 1,
+                            'score': reply_data.get('score', 0),
+                            'scraped_at': scraped_at
+                        }
+                        
+                        pending.append(reply_record)
+                        thread_replies += 1
                 
-                # Check for high-quality reply threads
-                kids = comment_data.get('kids', [])
-                if kids and comment_data.get('score', 0) > 10:  # Popular comments
-                    thread_replies = 0
-                    
-                    for reply_id in kids[:5]:  # Top 5 replies
-                        reply_data = self.get_item_with_retry(reply_id)
-                        if reply_data and self.is_podcast_worthy_comment(reply_data, 1):
-                            reply_record = {
-                                'comment_id': str(reply_id),
-                                'article_id': story_id,
-                                'parent_id': str(comment_id),
-                                'author': reply_data.get('by', 'unknown'),
-                                'content': self.clean_html(reply_data.get('text', ''))[:self.max_comment_length],
-                                'time_posted': reply_data.get('time', 0),
-                                'level': 1,
-                                'score': reply_data.get('score', 0),
-                                'scraped_at': datetime.now().isoformat()
-                            }
-                            
-                            if self.db.insert_comment(reply_record):
-                                comments_stored += 1
-                                thread_replies += 1
-                    
-                    if thread_replies > 0:
-                        threads_found += 1
+                if thread_replies > 0:
+                    threads_found += 1
+        
+        # One BatchWriteItem round per 25 comments instead of a PutItem each
+        if pending:
+            if self.db.batch_write_comments(pending):
+                comments_stored = len(pending)
+            else:
+                threads_found = 0
         
         # Analysis
         if comment_scores:
-            avg_score = sum(comment_scores) / len(comment_scores)
-            max_score = max(comment_scores)
-            quality_comments = len([s for s in comment_scores if s >= self.min_comment_score])
+            # Total, max and quality count in one pass
+            total_score = 0
+            max_score = comment_scores[0]
+            quality_comments = 0
+            for score in comment_scores:
+                total_score += score
+                if score > max_score:
+                    max_score = score
+                if score >= self.min_comment_score:
+                    quality_comments += 1
+            avg_score = total_score / len(comment_scores)
             
             print(f"    📈 Comment quality analysis:")
             print(f"       Avg score: {avg_score:.1f}")
@@ -185,26 +332,110 @@ class PodcastOptimizedScraper:
         """Clean HTML from text."""
         if not text:
             return ''
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-        # Decode HTML entities
-        text = text.replace('&gt;', '>').replace('&lt;', '<')
-        text = text.replace('&amp;', '&').replace('&quot;', '"')
-        text = text.replace('&#x27;', "'").replace('&#x2F;', '/')
-        return text.strip()
+        # Remove HTML tags, then decode every HTML entity in one pass
+        return html.unescape(_TAG_RE.sub('', text)).strip()
+    
+    def clean_html_prefix(self, text: str, length: int) -> str:
+        """Return clean_html(text)[:length], cleaning only the head of long text."""
+        if not text:
+            return ''
+        # 2x margin for the markup and entities that cleaning removes
+        raw = text[:length * 2]
+        if len(raw) < len(text):
+            # Cut before the first '<' after the last '>', so an unclosed tag
+            # (which in the full text may run well past the cut) is dropped whole
+            cut = raw.find('<', raw.rfind('>') + 1)
+            if cut != -1:
+                raw = raw[:cut]
+            cleaned = self.clean_html(raw)
+            # Keep clear of an entity split at the end; heavy markup falls through
+            if len(cleaned) > length + 32:
+                return cleaned[:length]
+        return self.clean_html(text)[:length]
     
     def extract_domain(self, url: str) -> str:
-        """Extract domain from URL."""
+        """Extract domain from URL (cached, since hosts repeat across articles)."""
+        return _extract_domain(url)
+    
+    @staticmethod
+    def _new_stats() -> Dict:
+        """Zeroed scrape counters, per story and for the whole run."""
+        return {
+            'articles_analyzed': 0,
+            'articles_stored': 0,
+            'comments_stored': 0,
+            'discussion_threads': 0,
+            'articles_skipped_existing': 0,
+            'articles_skipped_quality': 0
+        }
+    
+    def process_story(self, story_id: int, existing: set = None) -> Dict:
+        """Check, store and scrape one story; returns its counts for the run stats.
+        
+        existing is a prefetched set of stored IDs; without it the story is
+        looked up on its own.
+        """
+        stats = self._new_stats()
+        
         try:
-            if not url:
-                return 'news.ycombinator.com'
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-            if domain.startswith('www.'):
-                domain = domain[4:]
-            return domain
-        except:
-            return 'unknown'
+            # Check if already exists
+            if existing is not None:
+                exists = str(story_id) in existing
+            else:
+                exists = self.db.article_exists(str(story_id))
+            if exists:
+                stats['articles_skipped_existing'] += 1
+                return stats
+            
+            # Be respectful to the API
+            self.throttle.wait()
+            
+            # Get article data
+            story_data = self.get_item_with_retry(story_id)
+            if not story_data:
+                return stats
+            
+            stats['articles_analyzed'] += 1
+            
+            # Check if podcast-worthy
+            if not self.is_podcast_worthy_article(story_data):
+                stats['articles_skipped_quality'] += 1
+                return stats
+            
+            print(f"\n📰 Processing: {story_data.get('title', '')[:60]}...")
+            print(f"    Score: {story_data.get('score', 0)}, Comments: {len(story_data.get('kids', []))}")
+            
+            # Store article
+            article = {
+                'hn_id': str(story_id),
+                'title': story_data.get('title', ''),
+                'url': story_data.get('url', ''),
+                'domain': self.extract_domain(story_data.get('url')),
+                'score': story_data.get('score', 0),
+                'author': story_data.get('by', 'unknown'),
+                'time_posted': story_data.get('time', 0),
+                'num_comments': len(story_data.get('kids', [])),
+                'story_text': self.clean_html_prefix(story_data.get('text', ''), 2000),
+                'story_type': story_data.get('type', 'story'),
+                'scraped_at': datetime.now().isoformat()
+            }
+            
+            if self.db.insert_article(article):
+                stats['articles_stored'] += 1
+                
+                # Process comments
+                comment_ids = story_data.get('kids', [])
+                if comment_ids:
+                    comment_stats = self.scrape_podcast_optimized_comments(str(story_id), comment_ids)
+                    stats['comments_stored'] += comment_stats['comments_stored']
+                    stats['discussion_threads'] += comment_stats['threads_found']
+                    
+                    print(f"    ✅ Stored {comment_stats['comments_stored']} comments in {comment_stats['threads_found']} threads")
+            
+        except Exception as e:
+            print(f"❌ Error processing story {story_id}: {e}")
+        
+        return stats
     
     def scrape_podcast_optimized_articles(self, limit: int = 10) -> Dict:
         """Scrape articles optimized for podcast generation."""
@@ -214,81 +445,28 @@ class PodcastOptimizedScraper:
         try:
             response = self.session.get(f"{self.base_url}/topstories.json", timeout=10)
             response.raise_for_status()
-            story_ids = response.json()[:50]  # Check more stories to find quality ones
+            story_ids = _response_json(response)[:50]  # Check more stories to find quality ones
         except Exception as e:
             print(f"❌ Error fetching stories: {e}")
             return {'success': False}
         
-        stats = {
-            'articles_analyzed': 0,
-            'articles_stored': 0,
-            'comments_stored': 0,
-            'discussion_threads': 0,
-            'articles_skipped_existing': 0,
-            'articles_skipped_quality': 0
-        }
+        stats = self._new_stats()
         
-        articles_processed = 0
+        # One batched lookup for every candidate instead of a GetItem each
+        existing = self.db.filter_existing_article_ids([str(story_id) for story_id in story_ids])
         
-        for story_id in story_ids:
-            if articles_processed >= limit:
-                break
-            
-            try:
-                # Check if already exists
-                if self.db.article_exists(str(story_id)):
-                    stats['articles_skipped_existing'] += 1
-                    continue
-                
-                # Get article data
-                story_data = self.get_item_with_retry(story_id)
-                if not story_data:
-                    continue
-                
-                stats['articles_analyzed'] += 1
-                
-                # Check if podcast-worthy
-                if not self.is_podcast_worthy_article(story_data):
-                    stats['articles_skipped_quality'] += 1
-                    continue
-                
-                print(f"\n📰 Processing: {story_data.get('title', '')[:60]}...")
-                print(f"    Score: {story_data.get('score', 0)}, Comments: {len(story_data.get('kids', []))}")
-                
-                # Store article
-                article = {
-                    'hn_id': str(story_id),
-                    'title': story_data.get('title', ''),
-                    'url': story_data.get('url', ''),
-                    'domain': self.extract_domain(story_data.get('url')),
-                    'score': story_data.get('score', 0),
-                    'author': story_data.get('by', 'unknown'),
-                    'time_posted': story_data.get('time', 0),
-                    'num_comments': len(story_data.get('kids', [])),
-                    'story_text': self.clean_html(story_data.get('text', ''))[:2000],
-                    'story_type': story_data.get('type', 'story'),
-                    'scraped_at': datetime.now().isoformat()
-                }
-                
-                if self.db.insert_article(article):
-                    stats['articles_stored'] += 1
-                    articles_processed += 1
-                    
-                    # Process comments
-                    comment_ids = story_data.get('kids', [])
-                    if comment_ids:
-                        comment_stats = self.scrape_podcast_optimized_comments(str(story_id), comment_ids)
-                        stats['comments_stored'] += comment_stats['comments_stored']
-                        stats['discussion_threads'] += comment_stats['threads_found']
-                        
-                        print(f"    ✅ Stored {comment_stats['comments_stored']} comments in {comment_stats['threads_found']} threads")
-                
-                # Be respectful to the API
-                time.sleep(0.2)
-                
-            except Exception as e:
-                print(f"❌ Error processing story {story_id}: {e}")
-                continue
+        # Stories go out in waves no larger than the number still needed, so
+        # the same stories are processed as when walking the list one by one.
+        # The DynamoDB calls process_story makes on these threads (article_exists,
+        # insert_article, batch_write_comments) use the thread-safe client.
+        position = 0
+        with ThreadPoolExecutor(max_workers=ARTICLE_WORKERS) as executor:
+            while stats['articles_stored'] < limit and position < len(story_ids):
+                wave = story_ids[position:position + limit - stats['articles_stored']]
+                position += len(wave)
+                for story_stats in executor.map(lambda story_id: self.process_story(story_id, existing), wave):
+                    for key, value in story_stats.items():
+                        stats[key] += value
         
         # Final report
         print(f"\n🎉 Podcast-optimized scraping complete!")
@@ -8,7 +8,6 @@ import os
 import sys
 from datetime import datetime
 from dotenv import load_dotenv, set_key
-import requests
 
 def check_environment():
     """Check if all required environment variables are set."""
@@ -169,6 +168,8 @@ def test_elevenlabs_connection():
         return False
     
     try:
+        import requests
+        
         # Test API connection with voice list
         url = "https://api.elevenlabs.io/v1/voices"
         headers = {
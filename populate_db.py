@@ -7,6 +7,23 @@ import sqlite3
 import json
 from datetime import datetime, timedelta
 
+# Write-path tuning for the bulk load: WAL journaling with NORMAL syncs,
+# temp b-trees in memory and a ~64MB page cache
+WRITE_PRAGMAS = [
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA cache_size = -64000',
+]
+
+# Loads of at least this many articles drop article_analyses' secondary
+# indexes first and rebuild them afterwards, one sorted build per index
+# instead of an index update per row
+BULK_INDEX_THRESHOLD = 1000
+
+# All sample timestamps are offsets from a single instant
+now = datetime.now()
+
 # Sample articles with realistic HN content
 sample_articles = [
     {
@@ -15,7 +32,7 @@ sample_articles = [
         'url': 'https://github.com/user/hn-analyzer',
         'domain': 'github.com',
         'summary': 'A comprehensive tool that scrapes Hacker News discussions and uses OpenAI to analyze comment sentiment, extract key insights, and identify the most valuable contributions to each thread.',
-        'generated_at': (datetime.now() - timedelta(hours=2)).isoformat()
+        'generated_at': (now - timedelta(hours=2)).isoformat()
     },
     {
         'hn_id': '38745123',
@@ -23,7 +40,7 @@ sample_articles = [
         'url': 'https://stateofjs.com/2024',
         'domain': 'stateofjs.com',
         'summary': 'Annual survey reveals React maintains dominance while new frameworks like Astro and SvelteKit gain significant traction. TypeScript adoption reaches 87% among professional developers.',
-        'generated_at': (datetime.now() - timedelta(hours=4)).isoformat()
+        'generated_at': (now - timedelta(hours=4)).isoformat()
     },
     {
         'hn_id': '38744567',
@@ -31,7 +48,7 @@ sample_articles = [
         'url': 'https://blog.example.com/leaving-google',
         'domain': 'blog.example.com',
         'summary': 'A senior engineer shares insights on Google\'s changing culture, the impact of layoffs, and why smaller companies offer more meaningful work and faster iteration cycles.',
-        'generated_at': (datetime.now() - timedelta(hours=6)).isoformat()
+        'generated_at': (now - timedelta(hours=6)).isoformat()
     },
     {
         'hn_id': '38743901',
@@ -39,7 +56,7 @@ sample_articles = [
         'url': 'https://nature.com/articles/breakthrough-co2-fuel',
         'domain': 'nature.com',
         'summary': 'Breakthrough research demonstrates a novel photocatalytic process that efficiently converts atmospheric CO2 into usable hydrocarbon fuels, potentially revolutionizing carbon capture technology.',
-        'generated_at': (datetime.now() - timedelta(hours=8)).isoformat()
+        'generated_at': (now - timedelta(hours=8)).isoformat()
     },
     {
         'hn_id': '38743445',
@@ -47,7 +64,7 @@ sample_articles = [
         'url': 'https://news.ycombinator.com/item?id=38743445',
         'domain': 'news.ycombinator.com',
         'summary': 'Community discussion on engineering management challenges, team structure, communication processes, and technical architecture decisions when rapidly scaling engineering teams.',
-        'generated_at': (datetime.now() - timedelta(hours=12)).isoformat()
+        'generated_at': (now - timedelta(hours=12)).isoformat()
     },
     {
         'hn_id': '38742889',
@@ -55,7 +72,7 @@ sample_articles = [
         'url': 'https://techblog.company.com/rust-migration',
         'domain': 'techblog.company.com',
         'summary': 'Engineering team shares their 18-month journey migrating from Python to Rust, covering performance gains, developer experience challenges, and key architectural decisions.',
-        'generated_at': (datetime.now() - timedelta(hours=16)).isoformat()
+        'generated_at': (now - timedelta(hours=16)).isoformat()
     },
     {
         'hn_id': '38742334',
@@ -63,7 +80,7 @@ sample_articles = [
         'url': 'https://openai.com/blog/gpt-5',
         'domain': 'openai.com',
         'summary': 'Next-generation language model introduces native video processing, improved reasoning capabilities, and significantly reduced hallucination rates compared to previous versions.',
-        'generated_at': (datetime.now() - timedelta(hours=20)).isoformat()
+        'generated_at': (now - timedelta(hours=20)).isoformat()
     },
     {
         'hn_id': '38741778',
@@ -71,7 +88,7 @@ sample_articles = [
         'url': 'https://engineering.bigtech.com/microservices-costs',
         'domain': 'engineering.bigtech.com',
         'summary': 'Detailed analysis of operational overhead, debugging complexity, and infrastructure costs that emerged after migrating to microservices architecture at scale.',
-        'generated_at': (datetime.now() - timedelta(hours=24)).isoformat()
+        'generated_at': (now - timedelta(hours=24)).isoformat()
     }
 ]
 
@@ -81,73 +98,102 @@ sample_comments = [
         'comment_id': 'comment_001',
         'content': 'This is exactly what I\'ve been looking for! The AI analysis of comment sentiment is particularly interesting. Have you considered adding support for other discussion platforms?',
         'quality_score': 8,
-        'analyzed_at': datetime.now().isoformat()
+        'analyzed_at': now.isoformat()
     },
     {
         'comment_id': 'comment_002', 
         'content': 'Great work! The GitHub repo looks solid. One suggestion: it would be helpful to have more documentation on the API endpoints.',
         'quality_score': 7,
-        'analyzed_at': datetime.now().isoformat()
+        'analyzed_at': now.isoformat()
     },
     {
         'comment_id': 'comment_003',
         'content': 'The TypeScript numbers don\'t surprise me. What\'s interesting is the growth in build tools - seems like the ecosystem is finally stabilizing.',
         'quality_score': 6,
-        'analyzed_at': datetime.now().isoformat()
+        'analyzed_at': now.isoformat()
     },
     {
         'comment_id': 'comment_004',
         'content': 'As someone who went through a similar transition, the points about team communication are spot on. The biggest challenge isn\'t technical.',
         'quality_score': 9,
-        'analyzed_at': datetime.now().isoformat()
+        'analyzed_at': now.isoformat()
     },
     {
         'comment_id': 'comment_005',
         'content': 'This could be huge for climate tech. The efficiency numbers look promising, but I\'d love to see more details on the scalability aspects.',
         'quality_score': 7,
-        'analyzed_at': datetime.now().isoformat()
+        'analyzed_at': now.isoformat()
     }
 ]
 
+def drop_secondary_indexes(cursor, table):
+    """Drop a table's explicit indexes and return the SQL that recreates them."""
+    cursor.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table,)
+    )
+    indexes = cursor.fetchall()
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX "{name}"')
+    return [sql for _, sql in indexes]
+
 def populate_database():
     """Populate the database with sample data."""
-    conn = sqlite3.connect('enhanced_hn_articles.db')
+    conn = sqlite3.connect('enhanced_hn_articles.db', isolation_level=None)
+    for pragma in WRITE_PRAGMAS:
+        conn.execute(pragma)
     cursor = conn.cursor()
     
-    # Clear existing data except the original sample
-    cursor.execute("DELETE FROM article_analyses WHERE hn_id != 'sample1'")
-    cursor.execute("DELETE FROM comment_analyses")
-    
-    # Insert sample articles
-    for article in sample_articles:
-        cursor.execute('''
-            INSERT OR REPLACE INTO article_analyses 
+    # One transaction for the whole load, managed by hand (autocommit mode) so
+    # sqlite3 never commits implicitly; IMMEDIATE takes the write lock up front
+    cursor.execute('BEGIN IMMEDIATE')
+    try:
+        # Clear existing data except the original sample
+        cursor.execute("DELETE FROM article_analyses WHERE hn_id != 'sample1'")
+        cursor.execute("DELETE FROM comment_analyses")
+        
+        # Insert sample articles
+        article_rows = [
+            (a['hn_id'], a['title'], a['url'], a['domain'], a['summary'], a['generated_at'])
+            for a in sample_articles
+        ]
+        rebuild_indexes = []
+        if len(article_rows) >= BULK_INDEX_THRESHOLD:
+            rebuild_indexes = drop_secondary_indexes(cursor, 'article_analyses')
+        cursor.executemany('''
+            INSERT INTO article_analyses 
             (hn_id, title, url, domain, summary, generated_at) 
             VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            article['hn_id'],
-            article['title'], 
-            article['url'],
-            article['domain'],
-            article['summary'],
-            article['generated_at']
-        ))
-    
-    # Insert sample comments
-    for comment in sample_comments:
-        cursor.execute('''
-            INSERT OR REPLACE INTO comment_analyses
+            ON CONFLICT(hn_id) DO UPDATE SET
+                title = excluded.title,
+                url = excluded.url,
+                domain = excluded.domain,
+                summary = excluded.summary,
+                generated_at = excluded.generated_at
+        ''', article_rows)
+        for sql in rebuild_indexes:
+            cursor.execute(sql)
+        
+        # Insert sample comments
+        comment_rows = [
+            (c['comment_id'], c['content'], c['quality_score'], c['analyzed_at'])
+            for c in sample_comments
+        ]
+        cursor.executemany('''
+            INSERT INTO comment_analyses
             (comment_id, content, quality_score, analyzed_at)
             VALUES (?, ?, ?, ?)
-        ''', (
-            comment['comment_id'],
-            comment['content'],
-            comment['quality_score'],
-            comment['analyzed_at']
-        ))
-    
-    conn.commit()
-    conn.close()
+            ON CONFLICT(comment_id) DO UPDATE SET
+                content = excluded.content,
+                quality_score = excluded.quality_score,
+                analyzed_at = excluded.analyzed_at
+        ''', comment_rows)
+        cursor.execute('COMMIT')
+    except sqlite3.Error:
+        cursor.execute('ROLLBACK')
+        raise
+    finally:
+        conn.close()
     
     print(f"Successfully populated database with {len(sample_articles)} articles and {len(sample_comments)} comments")
 
@@ -10,6 +10,15 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 import os
 
+# Blank-line section breaks and the conversational cues looked for in each section
+_SECTION_BREAK_RE = re.compile(r'\n\s*\n')
+_CONVERSATION_RES = [
+    re.compile(r'\b(says?|said|replied|responds?|commented|argues?|believes?|thinks?)\b', re.IGNORECASE),
+    re.compile(r'["\'"].*?["\'"]'),  # Quoted text
+    re.compile(r'\b(I think|In my opinion|IMO|IMHO|Actually|However|But|Well)\b', re.IGNORECASE),
+    re.compile(r'\b(you|your|we|our|us)\b', re.IGNORECASE),  # Personal pronouns
+]
+
 class ConversationAnalyzer:
     """Analyzes conversation patterns and quality in comment threads."""
     
@@ -22,17 +31,12 @@ class ConversationAnalyzer:
         conversations = []
         
         # Split content into sections that might be conversations
-        sections = re.split(r'\n\s*\n', content)
+        sections = _SECTION_BREAK_RE.split(content)
         
         for i, section in enumerate(sections):
             if len(section.strip()) > 50:  # Minimum length for meaningful conversation
                 # Check if section contains conversational patterns
-                conversational_indicators = [
-                    re.search(r'\b(says?|said|replied|responds?|commented|argues?|believes?|thinks?)\b', section, re.IGNORECASE),
-                    re.search(r'["\'"].*?["\'"]', section),  # Quoted text
-                    re.search(r'\b(I think|In my opinion|IMO|IMHO|Actually|However|But|Well)\b', section, re.IGNORECASE),
-                    re.search(r'\b(you|your|we|our|us)\b', section, re.IGNORECASE),  # Personal pronouns
-                ]
+                conversational_indicators = [pattern.search(section) for pattern in _CONVERSATION_RES]
                 
                 if any(conversational_indicators):
                     conversations.append({
@@ -23,6 +23,35 @@ from openai import OpenAI
 openai_client = OpenAI(api_key=os.environ.get('OPENAI_API_KEY')) if os.environ.get('OPENAI_API_KEY') else None
 
 
+# Comment analyses are always read per article, so they are clustered on
+# (hn_id, comment_id) in a WITHOUT ROWID table: lookups by hn_id are a
+# primary-key range scan with no separate index or rowid indirection.
+COMMENT_ANALYSES_COLUMNS = (
+    'comment_id, hn_id, parent_id, author, comment_text, analysis_summary, key_points, '
+    'sentiment, quality_score, is_insightful, is_controversial, thread_summary, generated_at'
+)
+
+COMMENT_ANALYSES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        comment_id TEXT NOT NULL,
+        hn_id TEXT NOT NULL,
+        parent_id TEXT,
+        author TEXT,
+        comment_text TEXT,
+        analysis_summary TEXT,
+        key_points TEXT,
+        sentiment TEXT,
+        quality_score INTEGER,
+        is_insightful BOOLEAN,
+        is_controversial BOOLEAN,
+        thread_summary TEXT,
+        generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (hn_id, comment_id),
+        FOREIGN KEY (hn_id) REFERENCES article_analyses (hn_id)
+    ) WITHOUT ROWID
+'''
+
+
 class AnalysisPreprocessor:
     """Pre-processes articles and comments using OpenAI and stores results in database."""
     
@@ -53,24 +82,8 @@ class AnalysisPreprocessor:
         ''')
         
         # Table for comment analyses and curation
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS comment_analyses (
-                comment_id TEXT PRIMARY KEY,
-                hn_id TEXT,
-                parent_id TEXT,
-                author TEXT,
-                comment_text TEXT,
-                analysis_summary TEXT,
-                key_points TEXT,
-                sentiment TEXT,
-                quality_score INTEGER,
-                is_insightful BOOLEAN,
-                is_controversial BOOLEAN,
-                thread_summary TEXT,
-                generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (hn_id) REFERENCES article_analyses (hn_id)
-            )
-        ''')
+        cursor.execute(COMMENT_ANALYSES_TABLE.format(table='comment_analyses'))
+        self._rebuild_comment_analyses(conn)
         
         # Table for discussion threads and conversations
         cursor.execute('''
@@ -107,6 +120,30 @@ class AnalysisPreprocessor:
         conn.close()
         print("✅ Database tables initialized")
     
+    def _rebuild_comment_analyses(self, conn):
+        """Convert a comment_analyses table created with a rowid to the clustered layout."""
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'comment_analyses'"
+        ).fetchone()
+        if not row or 'WITHOUT ROWID' in row[0].upper():
+            return
+        
+        try:
+            conn.commit()
+            conn.execute('BEGIN')
+            conn.execute(COMMENT_ANALYSES_TABLE.format(table='comment_analyses_new'))
+            conn.execute(f'''
+                INSERT INTO comment_analyses_new ({COMMENT_ANALYSES_COLUMNS})
+                SELECT {COMMENT_ANALYSES_COLUMNS} FROM comment_analyses
+            ''')
+            conn.execute('DROP TABLE comment_analyses')
+            conn.execute('ALTER TABLE comment_analyses_new RENAME TO comment_analyses')
+            conn.commit()
+            print("✅ Rebuilt comment_analyses as a WITHOUT ROWID table")
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"⚠️  Keeping existing comment_analyses layout: {e}")
+    
     def load_articles_data(self) -> List[Dict]:
         """Load articles from JSON file."""
         json_path = os.path.join(project_root, 'data', 'enhanced_hn_articles.json')
@@ -22,6 +22,30 @@ import requests
 import tldextract
 from bs4 import BeautifulSoup
 
+# Optional fast JSON encoder
+try:
+    import orjson
+    USE_ORJSON = True
+except ImportError:
+    USE_ORJSON = False
+
+# Only advertise brotli when urllib3 can decode it
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# Whitespace normalisation patterns, compiled once
+_WHITESPACE_RE = re.compile(r'\s+')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n\s*\n+')
+_INLINE_SPACE_RE = re.compile(r'[ \t]+')
+
+# Item-row lookups, built once instead of per row
+_TITLELINE_ATTRS = {'class': 'titleline'}
+_COMMENT_LINK_RE = re.compile(r"\d+\s+comment")
+_DIGITS_RE = re.compile(r'(\d+)')
+
 
 class EnhancedHackerNewsScraper:
     """Enhanced scraper that captures both articles and complete comment threads."""
@@ -30,7 +54,8 @@ class EnhancedHackerNewsScraper:
         self.base_url = "https://news.ycombinator.com"
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (compatible; Enhanced-HN-Scraper/2.0)'
+            'User-Agent': 'Mozilla/5.0 (compatible; Enhanced-HN-Scraper/2.0)',
+            'Accept-Encoding': ACCEPT_ENCODING
         })
         self.db_path = db_path
         self.logger = logging.getLogger(__name__)
@@ -143,7 +168,7 @@ class EnhancedHackerNewsScraper:
             return None
         
         # Look for the title link inside titleline span
-        titleline = item.find("span", class_="titleline")
+        titleline = item.find("span", attrs=_TITLELINE_ATTRS)
         if not titleline:
             return None
         
@@ -161,10 +186,10 @@ class EnhancedHackerNewsScraper:
         
         # Extract comment count and other metadata
         comment_count = 0
-        comments_link = meta_row.find("a", string=re.compile(r"\d+\s+comment"))
+        comments_link = meta_row.find("a", string=_COMMENT_LINK_RE)
         if comments_link:
             comment_text = comments_link.get_text()
-            comment_match = re.search(r'(\d+)', comment_text)
+            comment_match = _DIGITS_RE.search(comment_text)
             if comment_match:
                 comment_count = int(comment_match.group(1))
         
@@ -279,7 +304,7 @@ class EnhancedHackerNewsScraper:
                 return None
             
             # Remove excessive whitespace
-            content = re.sub(r'\s+', ' ', content)
+            content = _WHITESPACE_RE.sub(' ', content)
             
             return content
             
@@ -406,9 +431,8 @@ class EnhancedHackerNewsScraper:
         text = element.get_text()
         
         # Clean up excessive whitespace while preserving paragraph breaks
-        text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
-        text = re.sub(r'[ \t]+', ' ', text)
-        text = text.strip()
+        text = _BLANK_LINES_RE.sub('\n\n', text)
+        text = _INLINE_SPACE_RE.sub(' ', text).strip()
         
         return text
     
@@ -542,8 +566,12 @@ class EnhancedHackerNewsScraper:
     def save_to_json(self, articles: List[Dict], filename: str) -> None:
         """Save articles with comments to JSON file."""
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(articles, f, indent=2, ensure_ascii=False, default=str)
+            if USE_ORJSON:
+                with open(filename, 'wb') as f:
+                    f.write(orjson.dumps(articles, option=orjson.OPT_INDENT_2, default=str))
+            else:
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump(articles, f, indent=2, ensure_ascii=False, default=str)
             self.logger.info(f"Saved {len(articles)} articles to {filename}")
         except Exception as e:
             self.logger.error(f"Failed to save to JSON: {e}")
@@ -5,15 +5,25 @@ All functionalities integrated into a single homepage with comprehensive databas
 Features weekly podcast generation and playback.
 """
 
+import hashlib
 import json
 import os
 import sqlite3
 import sys
+import threading
+import time
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional
 
 import tldextract
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, jsonify, make_response, render_template, request
+
+try:
+    import orjson
+    USE_ORJSON = True
+except ImportError:
+    USE_ORJSON = False
 
 # Load environment variables
 from dotenv import load_dotenv
@@ -22,41 +32,225 @@ load_dotenv()
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 
+# Templates only change on deploy: skip the per-render mtime check, and
+# keep JSON keys in insertion order instead of sorting every response
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+app.jinja_env.auto_reload = False
+app.json.sort_keys = False
+
 # Database path
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'enhanced_hn_articles.db')
 
+# Stats only change on a scrape cycle; serve repeats from memory
+STATS_CACHE_SECONDS = 30
+
+# Rendered homepage variants are reused within this window
+HOMEPAGE_CACHE_SECONDS = 15
+
+# Homepage sort orders applied in SQL; whitelisted, never user-formatted
+ARTICLE_SORT_SQL = {
+    'quality': 'discussion_quality_score DESC, generated_at DESC',
+    'recent': 'hn_id DESC',
+    'controversial': "CASE WHEN controversy_level = 'high' THEN 0 ELSE 1 END, "
+                     "discussion_quality_score DESC, generated_at DESC",
+}
+
+# Prepared statements kept per connection (sqlite3 defaults to 100)
+SQL_STATEMENT_CACHE = 256
+
+# Read-path tuning for each web connection: page reads go through a 256MB
+# memory map (the database must live on a local filesystem, not NFS) and
+# sorter/temp b-trees stay in memory
+READ_PRAGMAS = [
+    'PRAGMA mmap_size = 268435456',
+    'PRAGMA temp_store = MEMORY',
+]
+
+# Indexes backing the read paths below, created once per process
+# (comment_analyses is clustered on (hn_id, comment_id), so it needs none)
+DB_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_ec_article ON enhanced_comments(article_hn_id)',
+    # Lets ORDER BY quality, recency walk the index instead of sorting
+    'CREATE INDEX IF NOT EXISTS idx_aa_quality_gen ON article_analyses(discussion_quality_score DESC, generated_at DESC)',
+    'CREATE INDEX IF NOT EXISTS idx_aa_domain ON article_analyses(domain)',
+    # MAX(generated_at) versions the loaded article set for ETags
+    'CREATE INDEX IF NOT EXISTS idx_aa_generated ON article_analyses(generated_at)',
+]
+
+# Full-text index over article analyses. It shares rowids with
+# article_analyses and is kept in sync by triggers; every insert clears its
+# rowid first so INSERT OR REPLACE (which skips delete triggers) stays correct.
+FTS_TRIGGERS = [
+    '''CREATE TRIGGER IF NOT EXISTS article_search_ai AFTER INSERT ON article_analyses BEGIN
+        DELETE FROM article_search WHERE rowid = new.rowid;
+        INSERT INTO article_search (rowid, hn_id, title, summary, key_insights)
+        VALUES (new.rowid, new.hn_id, new.title, new.summary, new.key_insights);
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS article_search_au AFTER UPDATE ON article_analyses BEGIN
+        DELETE FROM article_search WHERE rowid = old.rowid;
+        INSERT INTO article_search (rowid, hn_id, title, summary, key_insights)
+        VALUES (new.rowid, new.hn_id, new.title, new.summary, new.key_insights);
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS article_search_ad AFTER DELETE ON article_analyses BEGIN
+        DELETE FROM article_search WHERE rowid = old.rowid;
+    END''',
+]
+
+
+# Search queries are fixed strings with a bound domain filter so sqlite3 can
+# reuse the prepared statement instead of re-parsing per domain variant.
+_Q_SEARCH_FTS = '''
+    SELECT aa.hn_id, aa.title, aa.url, aa.domain, aa.summary, aa.key_insights,
+           aa.main_themes, aa.sentiment_analysis, aa.discussion_quality_score,
+           aa.controversy_level,
+           (SELECT COUNT(*) FROM comment_analyses ca WHERE ca.hn_id = aa.hn_id) as analyzed_comments
+    FROM article_search
+    JOIN article_analyses aa ON aa.rowid = article_search.rowid
+    WHERE article_search MATCH ?
+    AND (? IS NULL OR aa.domain = ?)
+    ORDER BY aa.discussion_quality_score DESC
+    LIMIT 50
+'''
+
+_Q_SEARCH_LIKE = '''
+    SELECT aa.hn_id, aa.title, aa.url, aa.domain, aa.summary, aa.key_insights,
+           aa.main_themes, aa.sentiment_analysis, aa.discussion_quality_score,
+           aa.controversy_level, COUNT(DISTINCT ca.comment_id) as analyzed_comments
+    FROM article_analyses aa
+    LEFT JOIN comment_analyses ca ON aa.hn_id = ca.hn_id
+    WHERE (aa.title LIKE ? OR aa.summary LIKE ? OR aa.key_insights LIKE ?)
+    AND (? IS NULL OR aa.domain = ?)
+    GROUP BY aa.hn_id
+    ORDER BY aa.discussion_quality_score DESC
+    LIMIT 50
+'''
+
+
+def ojsonify(obj):
+    """Build a JSON response, serialized with orjson when it is installed."""
+    if not USE_ORJSON:
+        return jsonify(obj)
+    return app.response_class(
+        orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, default=str),
+        mimetype='application/json'
+    )
+
+
+def build_fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query: every word must match as a prefix."""
+    terms = ['"' + term.replace('"', '""') + '"*' for term in query.split()]
+    return ' '.join(terms)
+
+
 class DatabaseManager:
     """Comprehensive database manager for all HN scraper data."""
     
     def __init__(self, db_path: str):
         self.db_path = db_path
+        self._indexes_ready = False
+        self._fts_ready = False
+        self._stats_cache = None
+        self._local = threading.local()
+        # Serializes the one-time index and search setup across threads
+        self._setup_lock = threading.Lock()
     
     def get_connection(self):
-        """Get database connection."""
-        return sqlite3.connect(self.db_path)
+        """Get this thread's database connection, opening it on first use.
+        
+        Connections live for the lifetime of the worker thread, so callers
+        must not close them.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, cached_statements=SQL_STATEMENT_CACHE)
+            for pragma in READ_PRAGMAS:
+                conn.execute(pragma)
+            if not self._indexes_ready:
+                with self._setup_lock:
+                    if not self._indexes_ready:
+                        self._ensure_indexes(conn)
+            # The web app only reads; index setup above is the one write it makes
+            conn.execute('PRAGMA query_only = 1')
+            self._local.conn = conn
+        return conn
+    
+    def _ensure_indexes(self, conn):
+        """Create the indexes used by the article and search queries.
+        
+        Called with _setup_lock held.
+        """
+        try:
+            for statement in DB_INDEXES:
+                conn.execute(statement)
+            conn.commit()
+            self._indexes_ready = True
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not create database indexes: {e}")
+        
+        if not self._fts_ready:
+            self._fts_ready = self._ensure_search_index(conn)
+    
+    def _ensure_search_index(self, conn) -> bool:
+        """Create and populate the article_search FTS5 table if missing."""
+        try:
+            # Hold the write lock so another process can't create it in between
+            conn.execute('BEGIN IMMEDIATE')
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'article_search'"
+            ).fetchone()
+            conn.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS article_search
+                USING fts5(hn_id UNINDEXED, title, summary, key_insights)
+            ''')
+            if not exists:
+                conn.execute('''
+                    INSERT INTO article_search (rowid, hn_id, title, summary, key_insights)
+                    SELECT rowid, hn_id, title, summary, key_insights FROM article_analyses
+                ''')
+            for statement in FTS_TRIGGERS:
+                conn.execute(statement)
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"⚠️  Full-text search unavailable, using LIKE search: {e}")
+            return False
     
-    def get_all_articles_with_analysis(self) -> List[Dict]:
+    def get_all_articles_with_analysis(self, sort_by: str = 'quality') -> List[Dict]:
         """Get all articles with comprehensive analysis data."""
         conn = self.get_connection()
         cursor = conn.cursor()
+        order_by = ARTICLE_SORT_SQL.get(sort_by, ARTICLE_SORT_SQL['quality'])
         
         # Get articles with analysis data
+        cursor.execute(f'''
+            SELECT hn_id, title, url, domain, summary, 
+                   key_insights, main_themes, sentiment_analysis,
+                   discussion_quality_score, controversy_level, generated_at
+            FROM article_analyses
+            ORDER BY {order_by}
+        ''')
+        rows = cursor.fetchall()
+        
+        # Per-article comment counts, aggregated once per table rather than
+        # joined (the double LEFT JOIN multiplied comment rows per article)
         cursor.execute('''
-            SELECT aa.hn_id, aa.title, aa.url, aa.domain, aa.summary, 
-                   aa.key_insights, aa.main_themes, aa.sentiment_analysis,
-                   aa.discussion_quality_score, aa.controversy_level, aa.generated_at,
-                   COUNT(DISTINCT ca.comment_id) as analyzed_comments,
-                   COUNT(DISTINCT ec.id) as total_comments,
-                   AVG(ca.quality_score) as avg_comment_quality
-            FROM article_analyses aa
-            LEFT JOIN comment_analyses ca ON aa.hn_id = ca.hn_id
-            LEFT JOIN enhanced_comments ec ON aa.hn_id = ec.article_hn_id
-            GROUP BY aa.hn_id
-            ORDER BY aa.discussion_quality_score DESC, aa.generated_at DESC
+            SELECT hn_id, COUNT(*), AVG(quality_score)
+            FROM comment_analyses
+            GROUP BY hn_id
+        ''')
+        analyzed = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        
+        cursor.execute('''
+            SELECT article_hn_id, COUNT(*)
+            FROM enhanced_comments
+            GROUP BY article_hn_id
         ''')
+        enhanced = dict(cursor.fetchall())
         
         articles = []
-        for row in cursor.fetchall():
+        for row in rows:
+            analyzed_count, avg_quality = analyzed.get(row[0], (0, None))
             article = {
                 'hn_id': row[0],
                 'title': row[1],
@@ -69,13 +263,12 @@ class DatabaseManager:
                 'discussion_quality_score': row[8] or 0,
                 'controversy_level': row[9],
                 'generated_at': row[10],
-                'analyzed_comments': row[11] or 0,
-                'total_comments': row[12] or 0,
-                'avg_comment_quality': round(row[13] or 0, 1)
+                'analyzed_comments': analyzed_count,
+                'total_comments': enhanced.get(row[0], 0),
+                'avg_comment_quality': round(avg_quality or 0, 1)
             }
             articles.append(article)
         
-        conn.close()
         return articles
     
     def get_article_detail_with_analysis(self, hn_id: str) -> Optional[Dict]:
@@ -92,7 +285,6 @@ class DatabaseManager:
         
         article_row = cursor.fetchone()
         if not article_row:
-            conn.close()
             return None
         
         article = {
@@ -225,7 +417,6 @@ class DatabaseManager:
         
         article['enhanced_summaries'] = enhanced_summaries
         
-        conn.close()
         return article
     
     def get_curated_comments(self, limit: int = 10) -> List[Dict]:
@@ -258,37 +449,50 @@ class DatabaseManager:
             }
             curated.append(comment)
         
-        conn.close()
         return curated
     
+    def get_last_write(self) -> str:
+        """Timestamp of the newest article analysis, or '' for an empty table."""
+        cursor = self.get_connection().cursor()
+        cursor.execute('SELECT MAX(generated_at) FROM article_analyses')
+        return str(cursor.fetchone()[0] or '')
+    
     def get_stats_with_analysis(self) -> Dict:
         """Get comprehensive statistics from all database tables."""
+        bucket = int(time.time() // STATS_CACHE_SECONDS)
+        cached = self._stats_cache
+        if cached and cached[0] == bucket:
+            return cached[1]
+        
+        stats = self._query_stats()
+        self._stats_cache = (bucket, stats)
+        return stats
+    
+    def _query_stats(self) -> Dict:
+        """Run the statistics queries against the database."""
         conn = self.get_connection()
         cursor = conn.cursor()
         
         stats = {}
         
-        # Basic counts
-        cursor.execute('SELECT COUNT(*) FROM article_analyses')
-        stats['total_articles'] = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(*) FROM comment_analyses')
-        stats['analyzed_comments'] = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(*) FROM enhanced_comments')
-        stats['total_comments'] = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(*) FROM discussion_threads')
-        stats['discussion_threads'] = cursor.fetchone()[0]
-        
-        # Quality metrics
-        cursor.execute('SELECT AVG(discussion_quality_score) FROM article_analyses WHERE discussion_quality_score IS NOT NULL')
-        result = cursor.fetchone()[0]
-        stats['avg_discussion_quality'] = round(result, 2) if result else 0
+        # Counts and quality averages in a single round trip
+        cursor.execute('''
+            SELECT
+                (SELECT COUNT(*) FROM article_analyses),
+                (SELECT COUNT(*) FROM comment_analyses),
+                (SELECT COUNT(*) FROM enhanced_comments),
+                (SELECT COUNT(*) FROM discussion_threads),
+                (SELECT AVG(discussion_quality_score) FROM article_analyses WHERE discussion_quality_score IS NOT NULL),
+                (SELECT AVG(quality_score) FROM comment_analyses WHERE quality_score IS NOT NULL),
+                (SELECT COUNT(*) FROM comment_analyses WHERE is_insightful = 1),
+                (SELECT COUNT(*) FROM comment_analyses WHERE is_controversial = 1)
+        ''')
+        (stats['total_articles'], stats['analyzed_comments'], stats['total_comments'],
+         stats['discussion_threads'], avg_discussion_quality, avg_comment_quality,
+         insightful_comments, controversial_comments) = cursor.fetchone()
         
-        cursor.execute('SELECT AVG(quality_score) FROM comment_analyses WHERE quality_score IS NOT NULL')
-        result = cursor.fetchone()[0]
-        stats['avg_comment_quality'] = round(result, 2) if result else 0
+        stats['avg_discussion_quality'] = round(avg_discussion_quality, 2) if avg_discussion_quality else 0
+        stats['avg_comment_quality'] = round(avg_comment_quality, 2) if avg_comment_quality else 0
         
         # Sentiment distribution
         cursor.execute('SELECT sentiment_analysis, COUNT(*) FROM article_analyses GROUP BY sentiment_analysis')
@@ -309,11 +513,8 @@ class DatabaseManager:
         stats['top_domains'] = [{'domain': row[0], 'count': row[1]} for row in cursor.fetchall()]
         
         # Insightful vs controversial comments
-        cursor.execute('SELECT COUNT(*) FROM comment_analyses WHERE is_insightful = 1')
-        stats['insightful_comments'] = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(*) FROM comment_analyses WHERE is_controversial = 1')
-        stats['controversial_comments'] = cursor.fetchone()[0]
+        stats['insightful_comments'] = insightful_comments
+        stats['controversial_comments'] = controversial_comments
         
         # Source distribution for enhanced comments
         cursor.execute('SELECT source, COUNT(*) FROM enhanced_comments GROUP BY source')
@@ -322,7 +523,6 @@ class DatabaseManager:
             source_dist[row[0]] = row[1]
         stats['comment_sources'] = source_dist
         
-        conn.close()
         return stats
     
     def search_comprehensive(self, query: str, domain: str = None) -> List[Dict]:
@@ -330,32 +530,26 @@ class DatabaseManager:
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        search_term = f'%{query}%'
         results = []
+        rows = None
+        domain = domain or None
         
-        # Build the WHERE clause for domain filtering
-        domain_filter = ""
-        params = [search_term, search_term, search_term]
-        
-        if domain:
-            domain_filter = " AND aa.domain = ?"
-            params.append(domain)
+        if self._fts_ready and query.strip():
+            # Indexed full-text match on title, summary and key insights
+            try:
+                cursor.execute(_Q_SEARCH_FTS, (build_fts_query(query), domain, domain))
+                rows = cursor.fetchall()
+            except sqlite3.OperationalError as e:
+                print(f"⚠️  Full-text query failed, using LIKE search: {e}")
         
-        # Search articles with analysis
-        cursor.execute(f'''
-            SELECT aa.hn_id, aa.title, aa.url, aa.domain, aa.summary, aa.key_insights,
-                   aa.main_themes, aa.sentiment_analysis, aa.discussion_quality_score,
-                   aa.controversy_level, COUNT(DISTINCT ca.comment_id) as analyzed_comments
-            FROM article_analyses aa
-            LEFT JOIN comment_analyses ca ON aa.hn_id = ca.hn_id
-            WHERE (aa.title LIKE ? OR aa.summary LIKE ? OR aa.key_insights LIKE ?)
-            {domain_filter}
-            GROUP BY aa.hn_id
-            ORDER BY aa.discussion_quality_score DESC
-            LIMIT 50
-        ''', params)
+        if rows is None:
+            search_term = f'%{query}%'
+            
+            # Search articles with analysis
+            cursor.execute(_Q_SEARCH_LIKE, (search_term, search_term, search_term, domain, domain))
+            rows = cursor.fetchall()
         
-        for row in cursor.fetchall():
+        for row in rows:
             article = {
                 'hn_id': row[0],
                 'title': row[1],
@@ -371,7 +565,6 @@ class DatabaseManager:
             }
             results.append(article)
         
-        conn.close()
         return results
 
 # Initialize database manager
@@ -381,6 +574,9 @@ db_manager = DatabaseManager(DB_PATH)
 articles_data = []
 domains = set()
 
+# ETag for the loaded articles_data, versioned by its source's last write
+articles_etag = ''
+
 # Core utility functions (defined early to ensure availability)
 def count_comments_recursive(comments):
     """Recursively count all comments including replies."""
@@ -427,13 +623,20 @@ except Exception as e:
     print(f"⚠️  Error loading conversation analyzer: {e}")
 
 
+def _version_etag(source: str, version) -> str:
+    """Short opaque ETag for a data source version."""
+    return hashlib.blake2b(f"{source}:{version}".encode('utf-8'), digest_size=8).hexdigest()
+
+
 def load_articles() -> None:
     """Load articles from database with fallback to JSON file."""
-    global articles_data, domains
+    global articles_data, domains, articles_etag
     
+    articles_etag = ''
     try:
         # Try to load from database first
         articles_data = db_manager.get_all_articles_with_analysis()
+        articles_etag = _version_etag('db', db_manager.get_last_write())
         
         # Extract domains from database articles
         domains = set()
@@ -457,6 +660,7 @@ def load_articles() -> None:
         try:
             with open(json_path, 'r', encoding='utf-8') as f:
                 json_articles = json.load(f)
+            articles_etag = _version_etag('json', os.path.getmtime(json_path))
                 
             # Convert JSON format to match database format
             articles_data = []
@@ -776,42 +980,52 @@ def index():
     view_mode = request.args.get('view', 'cards')
     sort_by = request.args.get('sort', 'quality')
     
+    bucket = int(time.time() // HOMEPAGE_CACHE_SECONDS)
     try:
-        # Get comprehensive articles with AI analysis
-        articles_data = db_manager.get_all_articles_with_analysis()
-        
-        # Apply search filter
-        if search_query:
-            search_results = db_manager.search_comprehensive(search_query, domain_filter if domain_filter != 'all' else None)
-            articles_data = search_results
-        elif domain_filter and domain_filter != 'all':
-            articles_data = [a for a in articles_data if a.get('domain') == domain_filter]
-        
-        # Sort articles based on selection
-        if sort_by == 'quality':
-            articles_data.sort(key=lambda x: x.get('discussion_quality_score', 0), reverse=True)
-        elif sort_by == 'comments':
-            articles_data.sort(key=lambda x: x.get('total_comments', 0), reverse=True)
-        elif sort_by == 'recent':
-            articles_data.sort(key=lambda x: x.get('hn_id', '0'), reverse=True)
-        elif sort_by == 'controversial':
-            articles_data.sort(key=lambda x: (x.get('controversy_level') == 'high', x.get('discussion_quality_score', 0)), reverse=True)
-        
-        # Get comprehensive statistics
-        stats = db_manager.get_stats_with_analysis()
-        
-        # Get all available domains
-        available_domains = list(set(a.get('domain', '') for a in articles_data if a.get('domain')))
-        available_domains.sort()
-        
-        # Limit to first 50 articles for performance
-        articles_data = articles_data[:50]
-        
+        html = _render_homepage(search_query, domain_filter, view_mode, sort_by, bucket)
     except Exception as e:
         print(f"Database error, falling back to classic view: {e}")
         from flask import redirect
         return redirect('/classic')
     
+    response = make_response(html)
+    response.set_etag(hashlib.blake2b(html.encode('utf-8'), digest_size=8).hexdigest())
+    return response.make_conditional(request)
+
+
+@lru_cache(maxsize=64)
+def _render_homepage(search_query: str, domain_filter: str, view_mode: str, sort_by: str, bucket: int) -> str:
+    """Render the homepage; the bucket argument expires cached renders."""
+    # Apply search filter
+    if search_query:
+        search_results = db_manager.search_comprehensive(search_query, domain_filter if domain_filter != 'all' else None)
+        articles_data = search_results
+        
+        # Search results come back ranked by quality
+        if sort_by == 'recent':
+            articles_data.sort(key=lambda x: x.get('hn_id', '0'), reverse=True)
+        elif sort_by == 'controversial':
+            articles_data.sort(key=lambda x: (x.get('controversy_level') == 'high', x.get('discussion_quality_score', 0)), reverse=True)
+    else:
+        # Get comprehensive articles with AI analysis, already in sort order
+        articles_data = db_manager.get_all_articles_with_analysis(sort_by)
+        if domain_filter and domain_filter != 'all':
+            articles_data = [a for a in articles_data if a.get('domain') == domain_filter]
+    
+    # Comment totals are merged in Python, so that order can't come from SQL
+    if sort_by == 'comments':
+        articles_data.sort(key=lambda x: x.get('total_comments', 0), reverse=True)
+    
+    # Get comprehensive statistics
+    stats = db_manager.get_stats_with_analysis()
+    
+    # Get all available domains
+    available_domains = list(set(a.get('domain', '') for a in articles_data if a.get('domain')))
+    available_domains.sort()
+    
+    # Limit to first 50 articles for performance
+    articles_data = articles_data[:50]
+    
     return render_template('index.html',
                          articles=articles_data,
                          domains=available_domains,
@@ -869,17 +1083,27 @@ def classic_view():
 @app.route('/api/articles')
 def api_articles():
     """API endpoint for articles data."""
+    # Articles only change when they are reloaded, so a client holding the
+    # current version can skip the filtering and serialization entirely
+    if articles_etag and request.if_none_match.contains(articles_etag):
+        response = make_response('', 304)
+        response.set_etag(articles_etag)
+        return response
+    
     search_query = request.args.get('search', '')
     domain_filter = request.args.get('domain', 'all')
     min_length = int(request.args.get('min_length', 0))
     
     filtered_articles = filter_articles(search_query, domain_filter, min_length)
     
-    return jsonify({
+    response = ojsonify({
         'articles': filtered_articles,
         'total': len(filtered_articles),
         'total_available': len(articles_data)
     })
+    if articles_etag:
+        response.set_etag(articles_etag)
+    return response
 
 
 @app.route('/api/stats')
@@ -887,11 +1111,11 @@ def api_stats():
     """API endpoint for comprehensive statistics."""
     try:
         stats = db_manager.get_stats_with_analysis()
-        return jsonify(stats)
+        return ojsonify(stats)
     except Exception as e:
         print(f"Error getting comprehensive stats: {e}")
         # Fallback to basic stats
-        return jsonify(get_statistics())
+        return ojsonify(get_statistics())
 
 
 @app.route('/api/article/<hn_id>')
@@ -901,7 +1125,7 @@ def api_article_detail(hn_id):
         article = db_manager.get_article_detail_with_analysis(hn_id)
         if not article:
             return jsonify({'error': 'Article not found'}), 404
-        return jsonify(article)
+        return ojsonify(article)
     except Exception as e:
         print(f"Error getting article detail: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -913,7 +1137,7 @@ def api_curated_comments():
     try:
         limit = int(request.args.get('limit', 10))
         curated = db_manager.get_curated_comments(limit)
-        return jsonify(curated)
+        return ojsonify(curated)
     except Exception as e:
         print(f"Error getting curated comments: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -930,7 +1154,7 @@ def api_comprehensive_search():
             return jsonify([])
         
         results = db_manager.search_comprehensive(query, domain)
-        return jsonify(results)
+        return ojsonify(results)
     except Exception as e:
         print(f"Error in comprehensive search: {e}")
         return jsonify({'error': 'Search failed'}), 500
@@ -975,9 +1199,7 @@ def api_analysis_summary():
         
         source_breakdown = dict(cursor.fetchall())
         
-        conn.close()
-        
-        return jsonify({
+        return ojsonify({
             'articles': {
                 'total': article_summary[0],
                 'avg_quality': round(article_summary[1] or 0, 2),
@@ -1052,9 +1274,7 @@ def api_trending_insights():
                 'article_title': row[5]
             })
         
-        conn.close()
-        
-        return jsonify({
+        return ojsonify({
             'trending_articles': trending_articles,
             'top_insights': top_insights
         })
@@ -1071,7 +1291,7 @@ def api_domains():
         # Try to get domain stats from database
         stats = db_manager.get_stats_with_analysis()
         if stats and 'top_domains' in stats:
-            return jsonify(stats['top_domains'])
+            return ojsonify(stats['top_domains'])
     except Exception as e:
         print(f"Error getting domain stats from database: {e}")
     
@@ -1098,7 +1318,7 @@ def api_domains():
             stats['avg_content_length'] = sum(stats['content_lengths']) // len(stats['content_lengths'])
         del stats['content_lengths']  # Remove raw data
     
-    return jsonify(domain_stats)
+    return ojsonify(domain_stats)
 
 
 @app.route('/chat/article/<article_id>', methods=['POST'])
@@ -1165,7 +1385,7 @@ def search():
             results.sort(key=lambda x: int(x.get('hn_id', '0')), reverse=True)
         # Default is relevance (already filtered by match)
         
-        return jsonify(results[:20])  # Limit to 20 results
+        return ojsonify(results[:20])  # Limit to 20 results
         
     except Exception as e:
         print(f"Search error: {e}")
@@ -1506,4 +1726,6 @@ if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8084))
     print(f"Starting Flask app with {len(articles_data)} articles")
     print(f"Available at: http://127.0.0.1:{port}")
+    # Compile the homepage template before the first request
+    app.jinja_env.get_template('index.html')
     app.run(host='0.0.0.0', port=port, debug=False)
@@ -351,6 +351,71 @@ class TestDynamoDBManagerMocked(unittest.TestCase):
             self.assertEqual(manager.comments_table_name, 'hn-scraper-comments')
         
         print("✅ Mocked initialization test passed")
+    
+    @patch('dynamodb_manager.boto3.resource')
+    def test_batch_write_articles_with_mock(self, mock_boto3_resource):
+        """Test that batched article writes go through BatchWriteItem 25 at a time."""
+        print("\n🎭 Testing batched writes with mocked AWS...")
+        
+        mock_dynamodb = MagicMock()
+        mock_table = MagicMock()
+        mock_table.table_status = 'ACTIVE'
+        mock_dynamodb.Table.return_value = mock_table
+        mock_boto3_resource.return_value = mock_dynamodb
+        
+        client = mock_dynamodb.meta.client
+        unprocessed = {'HN_article_data': [{'PutRequest': {'Item': {'hn_id': {'S': '29'}}}}]}
+        client.batch_write_item.side_effect = [{}, {'UnprocessedItems': unprocessed}, {}]
+        
+        manager = DynamoDBManager()
+        articles = [{'hn_id': i, 'title': f'Article {i}', 'score': '10'} for i in range(30)]
+        
+        self.assertTrue(manager.batch_write_articles(articles))
+        self.assertEqual(client.batch_write_item.call_count, 3)
+        
+        requests = [
+            call.kwargs['RequestItems']['HN_article_data']
+            for call in client.batch_write_item.call_args_list[:2]
+        ]
+        self.assertEqual([len(request) for request in requests], [25, 5])
+        first_item = requests[0][0]['PutRequest']['Item']
+        self.assertEqual(first_item['hn_id'], {'S': '0'})
+        self.assertEqual(first_item['score'], {'N': '10'})
+        
+        # Unprocessed items are sent again as returned
+        self.assertEqual(client.batch_write_item.call_args_list[2].kwargs['RequestItems'], unprocessed)
+        mock_table.batch_writer.assert_not_called()
+        
+        print("✅ Mocked batch write test passed")
+    
+    @patch('dynamodb_manager.boto3.resource')
+    def test_existing_article_ids_paginates_with_mock(self, mock_boto3_resource):
+        """Test that the ID scan follows every page of every segment."""
+        print("\n🎭 Testing segmented ID scan with mocked AWS...")
+        
+        mock_dynamodb = MagicMock()
+        mock_table = MagicMock()
+        mock_table.table_status = 'ACTIVE'
+        mock_dynamodb.Table.return_value = mock_table
+        mock_boto3_resource.return_value = mock_dynamodb
+        
+        def paginate(**kwargs):
+            segment = kwargs['Segment']
+            return [
+                {'Items': [{'hn_id': {'S': f'{segment}_a'}}]},
+                {'Items': [{'hn_id': {'S': f'{segment}_b'}}]}
+            ]
+        
+        paginator = mock_dynamodb.meta.client.get_paginator.return_value
+        paginator.paginate.side_effect = paginate
+        
+        manager = DynamoDBManager()
+        ids = manager.get_existing_article_ids(segments=2)
+        
+        self.assertEqual(ids, {'0_a', '0_b', '1_a', '1_b'})
+        mock_dynamodb.meta.client.get_paginator.assert_called_once_with('scan')
+        
+        print("✅ Mocked segmented scan test passed")
 
 def run_integration_tests():
     """Run integration tests that require actual DynamoDB connection."""
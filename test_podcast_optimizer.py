@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for podcast script generation in podcast_optimizer
+"""
+
+import json
+import os
+import sys
+import unittest
+from unittest.mock import Mock, patch
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import podcast_optimizer
+from podcast_optimizer import PodcastOptimizedCommentProcessor
+
+def make_processor(client):
+    """Build a processor with a mocked database and the given OpenAI client."""
+    with patch('podcast_optimizer.get_dynamo') as mock_get_dynamo, \
+         patch('podcast_optimizer.SCRIPT_CACHE_PATH', ':memory:'), \
+         patch.dict(os.environ, {'OPENAI_API_KEY': ''}):
+        processor = PodcastOptimizedCommentProcessor()
+    processor.db = mock_get_dynamo.return_value
+    processor.openai_client = client
+    processor.has_openai = True
+    return processor
+
+def make_candidate(hn_id):
+    """Build an (article, threads) pair with one small discussion."""
+    article = {'hn_id': hn_id, 'title': f'Article {hn_id}', 'score': 120, 'num_comments': 40}
+    threads = [{
+        'thread_id': f'{hn_id}_c1',
+        'engagement_score': 10,
+        'comments': [{'author': 'alice', 'content': 'A substantial point about the topic.', 'level': 0}]
+    }]
+    return article, threads
+
+def batch_output(scripts):
+    """Render Batch API output lines for a mapping of custom_id to script."""
+    return "\n".join(json.dumps({
+        'custom_id': custom_id,
+        'response': {'status_code': 200, 'body': {'choices': [{'message': {'content': script}}]}}
+    }) for custom_id, script in scripts.items())
+
+class TestPodcastScriptBatch(unittest.TestCase):
+    """Test the Batch API path and its fallbacks."""
+
+    def test_submit_batch_returns_scripts(self):
+        """A completed batch maps each custom_id to its script."""
+        client = Mock()
+        client.files.create.return_value = Mock(id='file_in')
+        client.batches.create.return_value = Mock(id='batch_1', status='in_progress')
+        client.batches.retrieve.return_value = Mock(id='batch_1', status='completed', output_file_id='file_out')
+        client.files.content.return_value = Mock(text=batch_output({'1': 'Script one', '2': 'Script two'}))
+        processor = make_processor(client)
+
+        with patch('podcast_optimizer.BATCH_POLL_SECONDS', 0):
+            scripts = processor.submit_batch([make_candidate('1'), make_candidate('2')])
+
+        self.assertEqual(scripts, {'1': 'Script one', '2': 'Script two'})
+        self.assertEqual(client.files.create.call_args.kwargs['purpose'], 'batch')
+        client.chat.completions.create.assert_not_called()
+
+    def test_submit_batch_cancels_after_max_wait(self):
+        """A batch still running past the wait cap is cancelled."""
+        client = Mock()
+        client.files.create.return_value = Mock(id='file_in')
+        client.batches.create.return_value = Mock(id='batch_1', status='in_progress')
+        processor = make_processor(client)
+
+        with patch('podcast_optimizer.BATCH_MAX_WAIT_SECONDS', 0):
+            scripts = processor.submit_batch([make_candidate('1')])
+
+        self.assertEqual(scripts, {})
+        client.batches.cancel.assert_called_once_with('batch_1')
+        client.batches.retrieve.assert_not_called()
+
+    def test_generate_without_batch_api_requests_directly(self):
+        """Without client.batches the scripts are generated with direct requests."""
+        client = Mock(spec=['chat', 'files'])
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = 'Direct script'
+        client.chat.completions.create.return_value = response
+        processor = make_processor(client)
+
+        candidates = [make_candidate('1'), make_candidate('2')]
+        processor.db.get_articles.return_value = [article for article, _ in candidates]
+        processor.db.batch_write_analyses.return_value = True
+
+        with patch.object(processor, 'extract_discussion_threads',
+                          side_effect=lambda hn_id: make_candidate(hn_id)[1]):
+            episodes = processor.generate_daily_podcast_episodes(use_batch=True)
+
+        self.assertEqual(sorted(e['article_id'] for e in episodes), ['1', '2'])
+        self.assertTrue(all(e['script'] == 'Direct script' for e in episodes))
+        self.assertEqual(client.chat.completions.create.call_count, 2)
+        client.files.create.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,7 @@ Converts podcast scripts to MP3 audio files.
 """
 
 import os
+import re
 import json
 import boto3
 import logging
@@ -27,6 +28,9 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Word tokens for duration estimates (counted without building a list)
+_WORD_RE = re.compile(r'\S+')
+
 class TTSGenerator:
     """Handles text-to-speech generation using ElevenLabs API"""
     
@@ -184,7 +188,7 @@ class TTSGenerator:
         Estimate audio duration based on text length
         Rough estimate: ~150 words per minute for natural speech
         """
-        word_count = len(text.split())
+        word_count = sum(1 for _ in _WORD_RE.finditer(text))
         minutes = word_count / 150  # Average speaking rate
         return round(minutes, 2)
     
@@ -4,6 +4,7 @@ Creates placeholder audio files and demonstrates the TTS interface
 """
 
 import os
+import re
 import json
 import logging
 from datetime import datetime
@@ -18,6 +19,9 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Word tokens for duration estimates (counted without building a list)
+_WORD_RE = re.compile(r'\S+')
+
 class MockTTSGenerator:
     """Mock TTS generator for development and testing"""
     
@@ -60,7 +64,7 @@ class MockTTSGenerator:
                 "text": text,
                 "voice_id": voice_id or "adam",
                 "character_count": len(text),
-                "word_count": len(text.split()),
+                "word_count": sum(1 for _ in _WORD_RE.finditer(text)),
                 "estimated_duration_minutes": self.estimate_duration(text),
                 "generated_at": datetime.now().isoformat(),
                 "mock_file": True,
@@ -112,7 +116,7 @@ class MockTTSGenerator:
     
     def estimate_duration(self, text: str) -> float:
         """Estimate audio duration based on text length"""
-        word_count = len(text.split())
+        word_count = sum(1 for _ in _WORD_RE.finditer(text))
         minutes = word_count / 150  # Average speaking rate
         return round(minutes, 2)
     
@@ -242,7 +246,7 @@ class RealTTSGenerator:
     
     def estimate_duration(self, text: str) -> float:
         """Estimate audio duration based on text length"""
-        word_count = len(text.split())
+        word_count = sum(1 for _ in _WORD_RE.finditer(text))
         minutes = word_count / 150
         return round(minutes, 2)
     